@@ -0,0 +1,76 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from swarm_simulation import SwarmSimulation
+
+# Per-cycle summary of one realization
+METRICS = ("deployment_rate", "ozone_mean", "ozone_min", "predicted_drop_mean")
+
+
+def realization_seeds(seed, num_realizations):
+    # One independent stream per realization (not per worker), so results do
+    # not depend on how realizations are spread over the pool
+    children = np.random.SeedSequence(seed).spawn(num_realizations)
+    return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+
+def run_realization(seed, num_units, num_cycles):
+    sim = SwarmSimulation(num_units=num_units, rng=random.Random(seed), verbose=False)
+    summary = np.empty((num_cycles, len(METRICS)))
+    for cycle in range(num_cycles):
+        sim.step()
+        ozone = [unit.ozone_level for unit in sim.units]
+        summary[cycle] = (
+            sum(unit.payload_deployed for unit in sim.units) / num_units,
+            sum(ozone) / num_units,
+            min(ozone),
+            sum(unit.predicted_drop for unit in sim.units) / num_units,
+        )
+    return summary
+
+
+def _run_batch(seeds, num_units, num_cycles):
+    return np.stack([run_realization(seed, num_units, num_cycles) for seed in seeds])
+
+
+def run_ensemble(num_realizations=100, num_units=5, num_cycles=10, seed=0,
+                 workers=None, percentiles=(5, 50, 95)):
+    # Run independent SwarmSimulation realizations over a process pool and
+    # return per-cycle statistics across realizations:
+    # {"cycle": [...], "<metric>_mean": [...], "<metric>_p<q>": [...], ...}
+    workers = workers or os.cpu_count() or 1
+    seeds = realization_seeds(seed, num_realizations)
+
+    # A few batches per worker keeps the pool busy without paying IPC per realization
+    batch_size = max(1, -(-num_realizations // (workers * 4)))
+    batches = [seeds[i:i + batch_size] for i in range(0, num_realizations, batch_size)]
+
+    if workers == 1:
+        results = [_run_batch(batch, num_units, num_cycles) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _run_batch, batches,
+                [num_units] * len(batches), [num_cycles] * len(batches),
+            ))
+
+    # (realizations, cycles, metrics), always in realization order
+    runs = np.concatenate(results)
+    stats = {"cycle": np.arange(1, num_cycles + 1)}
+    for m, name in enumerate(METRICS):
+        stats[f"{name}_mean"] = runs[:, :, m].mean(axis=0)
+        for q, values in zip(percentiles, np.percentile(runs[:, :, m], percentiles, axis=0)):
+            stats[f"{name}_p{q}"] = values
+    return stats
+
+
+if __name__ == "__main__":
+    stats = run_ensemble(num_realizations=1000, num_units=50, num_cycles=10, seed=42)
+    print("Cycle | Deploy rate (mean) | Mean ozone p5 / p50 / p95")
+    for i, cycle in enumerate(stats["cycle"]):
+        print(f"{cycle:5d} | {stats['deployment_rate_mean'][i]:18.3f} | "
+              f"{stats['ozone_mean_p5'][i]:.2f} / {stats['ozone_mean_p50'][i]:.2f} / "
+              f"{stats['ozone_mean_p95'][i]:.2f}")
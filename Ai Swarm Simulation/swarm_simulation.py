@@ -1,8 +1,16 @@
+import math
 import random
 
 class SwarmUnit:
-    def __init__(self, unit_id):
+    def __init__(self, unit_id, rng=random, verbose=True, lat=None, lon=None, altitude=None):
         self.unit_id = unit_id
+        # Any object with uniform() (the random module or a random.Random)
+        self.rng = rng
+        self.verbose = verbose
+        # Position, random (evenly over the globe) unless given
+        self.lat = math.degrees(math.asin(rng.uniform(-1, 1))) if lat is None else lat
+        self.lon = rng.uniform(-180, 180) if lon is None else lon
+        self.altitude = round(rng.uniform(8000, 15000)) if altitude is None else altitude
         self.payload_deployed = False
         self.ozone_level = 3.0
         self.co2_level = 350
@@ -11,9 +19,9 @@ class SwarmUnit:
 
     def sense_environment(self):
         # Simulate sensing local ozone and gases with some variation
-        self.ozone_level = round(random.uniform(1.5, 4.0), 2)
-        self.co2_level = round(random.uniform(300, 420), 1)
-        self.nox_level = round(random.uniform(0.01, 0.15), 3)
+        self.ozone_level = round(self.rng.uniform(1.5, 4.0), 2)
+        self.co2_level = round(self.rng.uniform(300, 420), 1)
+        self.nox_level = round(self.rng.uniform(0.01, 0.15), 3)
 
     def predict_ozone_drop(self):
         # Simple AI prediction: ozone drop linked to CO2 and NOx
@@ -26,11 +34,13 @@ class SwarmUnit:
             self.deploy_sprayer()
         else:
             self.payload_deployed = False
-            print(f"{self.unit_id}: No deployment — ozone {self.ozone_level} ppm, predicted drop {self.predicted_drop:.3f}")
+            if self.verbose:
+                print(f"{self.unit_id}: No deployment — ozone {self.ozone_level} ppm, predicted drop {self.predicted_drop:.3f}")
 
     def deploy_sprayer(self):
         self.payload_deployed = True
-        print(f"{self.unit_id}: Deploying sprayer at ozone {self.ozone_level} ppm with predicted drop {self.predicted_drop:.3f}")
+        if self.verbose:
+            print(f"{self.unit_id}: Deploying sprayer at ozone {self.ozone_level} ppm with predicted drop {self.predicted_drop:.3f}")
 
     def cycle(self):
         self.sense_environment()
@@ -38,15 +48,108 @@ class SwarmUnit:
         self.decide_deployment()
 
 class SwarmSimulation:
-    def __init__(self, num_units=5):
-        self.units = [SwarmUnit(f"OTS-{i+1:03d}") for i in range(num_units)]
+    def __init__(self, num_units=5, rng=random, verbose=True, metrics=None, grid=None,
+                 spray_radius_km=None):
+        self.verbose = verbose
+        self.units = [SwarmUnit(f"OTS-{i+1:03d}", rng=rng, verbose=verbose) for i in range(num_units)]
+        # Optional per-cycle instrumentation (Code/swarm_metrics.py SwarmMetrics)
+        self.metrics = metrics
+        self.cycles_run = 0
+        # Optional spatial index (Code/spatial_grid.py SpatialHashGrid), rebuilt
+        # every cycle; with spray_radius_km set, a unit stands down when a
+        # lower-numbered unit within that radius is already spraying
+        self.grid = grid
+        self.spray_radius_km = spray_radius_km
+
+    def step(self):
+        self.cycles_run += 1
+        if self.metrics is not None:
+            self._instrumented_step(self.metrics)
+            return
+        for unit in self.units:
+            unit.cycle()
+        if self.grid is not None:
+            self.update_grid()
+            self.deconflict()
+
+    def positions(self):
+        return [unit.lat for unit in self.units], [unit.lon for unit in self.units]
+
+    def update_grid(self):
+        # One bulk rehash of every unit position
+        self.grid.rebuild(*self.positions())
+
+    def coverage(self):
+        # {(row, col): units} per occupied grid cell, as of the last update_grid()
+        return self.grid.coverage()
+
+    def deconflict(self):
+        # Stand down duplicate sprayers; returns how many. Pairs come from the
+        # grid, so this is proportional to the units nearby, not n².
+        if self.spray_radius_km is None:
+            return 0
+        first, second = self.grid.pairs_within(self.spray_radius_km)
+        spraying = [unit.payload_deployed for unit in self.units]
+        stood_down = 0
+        # In unit order, so each unit only defers to units already settled
+        for j, i in sorted(zip(second.tolist(), first.tolist())):
+            if spraying[i] and spraying[j]:
+                spraying[j] = False
+                unit = self.units[j]
+                unit.payload_deployed = False
+                stood_down += 1
+                if self.verbose:
+                    print(f"{unit.unit_id}: Standing down — {self.units[i].unit_id} is already spraying nearby")
+        return stood_down
+
+    def _instrumented_step(self, metrics):
+        # Same work phase by phase, so each phase can be timed; only sensing
+        # draws random numbers, so the results are identical
+        metrics.start_cycle(self.cycles_run, len(self.units))
+        with metrics.phase("sense"):
+            for unit in self.units:
+                unit.sense_environment()
+        with metrics.phase("predict"):
+            for unit in self.units:
+                unit.predict_ozone_drop()
+        deployed = [unit.payload_deployed for unit in self.units]
+        with metrics.phase("decide"):
+            for unit in self.units:
+                unit.decide_deployment()
+        if self.grid is not None:
+            with metrics.phase("deconflict"):
+                self.update_grid()
+                metrics.count("stood_down", self.deconflict())
+        # Once deconfliction has settled which units really spray;
+        # payload_deployed counts new deployments only, as in run_cycle
+        for unit, was_deployed in zip(self.units, deployed):
+            metrics.transition("deployed" if was_deployed else "idle",
+                               "deployed" if unit.payload_deployed else "idle")
+            if unit.payload_deployed and not was_deployed:
+                metrics.count("payload_deployed")
+        metrics.end_cycle()
 
     def run_cycles(self, num_cycles=10):
         for cycle_num in range(1, num_cycles + 1):
-            print(f"\n=== Simulation Cycle {cycle_num} ===")
-            for unit in self.units:
-                unit.cycle()
+            if self.verbose:
+                print(f"\n=== Simulation Cycle {cycle_num} ===")
+            self.step()
 
 if __name__ == "__main__":
-    sim = SwarmSimulation(num_units=5)
+    import sys
+
+    # Pass --metrics to record per-cycle timings and counters
+    metrics = None
+    if "--metrics" in sys.argv:
+        import os
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Code"))
+        from swarm_metrics import SwarmMetrics
+        metrics = SwarmMetrics("swarm_metrics.jsonl")
+
+    sim = SwarmSimulation(num_units=5, metrics=metrics)
     sim.run_cycles(num_cycles=10)
+
+    if metrics is not None:
+        metrics.close()
+        metrics.write_prometheus("swarm_metrics.prom")
+        print("\nMetrics saved to swarm_metrics.jsonl and swarm_metrics.prom")
@@ -1,17 +1,19 @@
-from skyfield.api import load
+from datetime import datetime, timedelta, timezone
+
+import matplotlib.pyplot as plt
 from skyfield.sgp4lib import EarthSatellite
+
+from maneuver_log import ManeuverLog
+from orbit_propagation import get_timescale, propagate_ground_tracks
+
 line1 = "1 25544U 98067A   24196.54791667  .00002182  00000-0  44647-4 0  9995"
 line2 = "2 25544  51.6445 160.8265 0008387  92.9338  25.4982 15.50629659351385"
-ts = load.timescale()
+ts = get_timescale()
 cube_sat = EarthSatellite(line1, line2, "CubeSat", ts)
-start = datetime.utcnow()
-end = start + timedelta(hours=6)
-times = ts.utc(start, end, 60)  # 60 time steps
-geo = cube_sat.subpoint(times)
-lat = geo.latitude.degrees
-lon = geo.longitude.degrees
-alt = geo.elevation.km
-import matplotlib.pyplot as plt
+start = datetime.now(timezone.utc)
+# 6 hours in 60 time steps; pass more satellites (e.g. load_tles(path)) for a constellation
+_, tracks = propagate_ground_tracks([cube_sat], start, timedelta(hours=6), step_seconds=360)
+lat, lon, alt = tracks[0, :, 0], tracks[0, :, 1], tracks[0, :, 2]
 
 plt.figure(figsize=(12, 6))
 plt.plot(lon, lat, label='CubeSat Path', color='dodgerblue')
@@ -27,16 +29,14 @@ confidence = 0.92
 if hotspot_detected and confidence > 0.85:
     print("🛸 Maneuver triggered: Adjusting orbit parameters...")
     # Optionally adjust your TLE or simulate new trajectory
-import json
 
 log = {
-    "timestamp": datetime.utcnow().isoformat(),
+    "timestamp": datetime.now(timezone.utc).isoformat(),
     "hotspot_triggered": hotspot_detected,
     "confidence": confidence,
-    "altitude_km": alt[-1]
+    "altitude_km": float(alt[-1])
 }
 
-with open("orbital_maneuver_log.json", "a") as f:
-    f.write(json.dumps(log) + "\n")
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt 
+# Segmented, time-indexed log; query with ManeuverLog(...).between(t1, t2)
+with ManeuverLog("orbital_maneuver_log") as maneuvers:
+    maneuvers.append(log)
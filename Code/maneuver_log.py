@@ -0,0 +1,188 @@
+import heapq
+import json
+import os
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+MANIFEST = "manifest.json"
+
+
+def _epoch(timestamp):
+    # ISO-8601 string or datetime -> seconds; naive times are UTC
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class ManeuverLog:
+    # Append-only log of maneuver events, stored as JSON lines in segments.
+    # Events are buffered and written in batches. A new segment starts when
+    # the current one passes max_segment_bytes or spans more than
+    # max_segment_seconds, or when an event is older than the previous one,
+    # so every segment is sorted by time. Each segment has a sidecar .idx
+    # file with "timestamp offset" every index_every events, and
+    # manifest.json holds the time span of every segment. A time-range query
+    # only opens the overlapping segments and seeks to the nearest index
+    # entry before the start time.
+
+    def __init__(self, directory, max_segment_bytes=64 * 1024 * 1024, max_segment_seconds=86400,
+                 batch_size=256, index_every=512):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.batch_size = batch_size
+        self.index_every = index_every
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self.segments = json.load(f)["segments"]
+        else:
+            self.segments = []
+        self._buffer = []  # (epoch, encoded line)
+        self._index_cache = {}
+        self._remove_orphans()
+        if self.segments:
+            self._recover(self.segments[-1])
+
+    def _remove_orphans(self):
+        # Segment files missing from the manifest were started by a rotation
+        # that crashed before the manifest was saved; a later rotation would
+        # reuse the name and append after their bytes
+        known = {segment["name"] for segment in self.segments}
+        for filename in os.listdir(self.directory):
+            name, suffix = os.path.splitext(filename)
+            if name.startswith("segment-") and suffix in (".jsonl", ".idx") and name not in known:
+                os.remove(os.path.join(self.directory, filename))
+
+    def _recover(self, segment):
+        # Drop anything written after the last manifest update (a batch cut
+        # short by a crash), so appends continue at the recorded offset
+        with open(self._path(segment, ".jsonl"), "ab") as f:
+            f.truncate(segment["bytes"])
+        index_path = self._path(segment, ".idx")
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                lines = [line for line in f if int(line.split()[1]) < segment["bytes"]]
+            with open(index_path, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+
+    # --- writing ---
+
+    def append(self, event):
+        # event: dict with an ISO "timestamp" (added as now, UTC, if missing)
+        if "timestamp" not in event:
+            event = {"timestamp": datetime.now(timezone.utc).isoformat(), **event}
+        line = (json.dumps(event) + "\n").encode("utf-8")
+        self._buffer.append((_epoch(event["timestamp"]), line))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def _path(self, segment, suffix):
+        return os.path.join(self.directory, f"{segment['name']}{suffix}")
+
+    def _needs_rotation(self, segment, ts, size):
+        return (segment is None
+                or ts < segment["last"]
+                or segment["bytes"] + size > self.max_segment_bytes
+                or ts - segment["first"] > self.max_segment_seconds)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        segment = self.segments[-1] if self.segments else None
+        data, index_lines = [], []
+        for ts, line in self._buffer:
+            if self._needs_rotation(segment, ts, len(line)) and (segment is None or segment["count"]):
+                self._write(segment, data, index_lines)
+                data, index_lines = [], []
+                segment = {"name": f"segment-{len(self.segments) + 1:06d}", "first": ts, "last": ts,
+                           "count": 0, "bytes": 0}
+                self.segments.append(segment)
+            if segment["count"] % self.index_every == 0:
+                index_lines.append(f"{ts!r} {segment['bytes']}\n")
+            data.append(line)
+            segment["count"] += 1
+            segment["bytes"] += len(line)
+            segment["last"] = ts
+        self._write(segment, data, index_lines)
+        self._buffer.clear()
+        self._save_manifest()
+
+    def _write(self, segment, data, index_lines):
+        if segment is None or not data:
+            return
+        with open(self._path(segment, ".jsonl"), "ab") as f:
+            f.write(b"".join(data))
+            f.flush()
+            os.fsync(f.fileno())
+        if index_lines:
+            with open(self._path(segment, ".idx"), "a", encoding="utf-8") as f:
+                f.writelines(index_lines)
+            self._index_cache.pop(segment["name"], None)
+
+    def _save_manifest(self):
+        # Written after the segment data, so the manifest never points past it
+        tmp_path = os.path.join(self.directory, MANIFEST + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"segments": self.segments}, f)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST))
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- reading ---
+
+    def _index(self, segment):
+        index = self._index_cache.get(segment["name"])
+        if index is None:
+            times, offsets = [], []
+            with open(self._path(segment, ".idx"), encoding="utf-8") as f:
+                for line in f:
+                    ts, offset = line.split()
+                    times.append(float(ts))
+                    offsets.append(int(offset))
+            index = self._index_cache[segment["name"]] = (times, offsets)
+        return index
+
+    def _scan(self, segment, lo, hi):
+        # (epoch, event) pairs of one segment within [lo, hi]
+        times, offsets = self._index(segment)
+        # Last index entry strictly before lo: with several events at the same
+        # time, later entries may skip some of the ones at exactly lo
+        offset = offsets[max(0, bisect_left(times, lo) - 1)]
+        with open(self._path(segment, ".jsonl"), "rb") as f:
+            f.seek(offset)
+            # The manifest byte count excludes any partly written batch
+            for line in iter(f.readline, b""):
+                if f.tell() > segment["bytes"]:
+                    break
+                event = json.loads(line)
+                ts = _epoch(event["timestamp"])
+                if ts > hi:
+                    break
+                if ts >= lo:
+                    yield ts, event
+
+    def between(self, start, end):
+        # Events with start <= timestamp <= end, in time order. Buffered
+        # events are flushed first.
+        self.flush()
+        lo, hi = _epoch(start), _epoch(end)
+        scans = [self._scan(segment, lo, hi) for segment in self.segments
+                 if segment["last"] >= lo and segment["first"] <= hi]
+        for _, event in heapq.merge(*scans, key=lambda item: item[0]):
+            yield event
+
+    def __len__(self):
+        return sum(segment["count"] for segment in self.segments) + len(self._buffer)
@@ -0,0 +1,94 @@
+from datetime import timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+from sgp4.api import SatrecArray, jday
+from skyfield.api import load
+from skyfield.iokit import parse_tle_file
+from skyfield.sgp4lib import theta_GMST1982
+
+# WGS-84 ellipsoid
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+
+@lru_cache(maxsize=None)
+def get_timescale():
+    # Loading the timescale reads leap second / Delta T tables; do it once
+    return load.timescale()
+
+
+def load_tles(path):
+    with open(path, "rb") as f:
+        return list(parse_tle_file(f, get_timescale()))
+
+
+def _julian_dates(start, offsets):
+    # UTC Julian dates as (whole, fraction) for SGP4
+    jd0, fr0 = jday(start.year, start.month, start.day, start.hour, start.minute,
+                    start.second + start.microsecond / 1e6)
+    fr = fr0 + offsets / 86400.0
+    whole = np.floor(fr)
+    return jd0 + whole, fr - whole
+
+
+def _teme_to_geodetic(r, whole_ut1, fraction_ut1):
+    # r: (satellites, times, 3) TEME km -> (satellites, times, 3) lat/lon deg, alt km.
+    # TEME -> Earth-fixed is a rotation by Greenwich sidereal time (polar motion ignored)
+    theta, _ = theta_GMST1982(whole_ut1, fraction_ut1)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    x = cos_t * r[..., 0] + sin_t * r[..., 1]
+    y = cos_t * r[..., 1] - sin_t * r[..., 0]
+    z = r[..., 2]
+
+    lon = np.arctan2(y, x)
+    p = np.hypot(x, y)
+    lat = np.arctan2(z, p * (1 - WGS84_E2))
+    for _ in range(4):
+        sin_lat = np.sin(lat)
+        n = WGS84_A_KM / np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+        lat = np.arctan2(z + WGS84_E2 * n * sin_lat, p)
+    sin_lat = np.sin(lat)
+    alt = p * np.cos(lat) + z * sin_lat - WGS84_A_KM * np.sqrt(1 - WGS84_E2 * sin_lat ** 2)
+    return np.stack([np.degrees(lat), np.degrees(lon), alt], axis=-1)
+
+
+def iter_ground_track_chunks(satellites, start, duration, step_seconds=60, chunk_steps=1440,
+                             dtype=np.float32):
+    # Yield (offsets_seconds, tracks) with tracks shaped (satellites, chunk, 3)
+    # holding latitude/longitude in degrees and altitude in km. Only one chunk
+    # of SGP4 output is alive at a time, so long horizons stay bounded.
+    # Samples that SGP4 cannot propagate (e.g. decayed orbits) are NaN.
+    # Naive start times are taken as UTC; aware ones are converted to UTC.
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc)
+    ts = get_timescale()
+    sat_array = SatrecArray([sat.model for sat in satellites])
+    total_seconds = duration.total_seconds() if isinstance(duration, timedelta) else duration
+    offsets = np.arange(0, total_seconds + step_seconds / 2, step_seconds, dtype=float)
+
+    for begin in range(0, len(offsets), chunk_steps):
+        chunk = offsets[begin:begin + chunk_steps]
+        jd, fr = _julian_dates(start, chunk)
+        errors, r, _ = sat_array.sgp4(jd, fr)
+        t = ts.utc(start.year, start.month, start.day, start.hour, start.minute,
+                   start.second + start.microsecond / 1e6 + chunk)
+        tracks = _teme_to_geodetic(r, t.whole, t.ut1_fraction).astype(dtype)
+        tracks[errors != 0] = np.nan
+        yield chunk, tracks
+
+
+def propagate_ground_tracks(satellites, start, duration, step_seconds=60, chunk_steps=1440,
+                            dtype=np.float32):
+    # Whole horizon as one (satellites, times, 3) array plus the time offsets in seconds
+    total_seconds = duration.total_seconds() if isinstance(duration, timedelta) else duration
+    num_times = len(np.arange(0, total_seconds + step_seconds / 2, step_seconds))
+    tracks = np.empty((len(satellites), num_times, 3), dtype=dtype)
+    offsets = np.empty(num_times)
+    for chunk, chunk_tracks in iter_ground_track_chunks(satellites, start, duration, step_seconds,
+                                                        chunk_steps, dtype):
+        begin = int(round(chunk[0] / step_seconds))
+        tracks[:, begin:begin + len(chunk)] = chunk_tracks
+        offsets[begin:begin + len(chunk)] = chunk
+    return offsets, tracks
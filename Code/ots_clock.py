@@ -0,0 +1,34 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+
+class SimulationClock:
+    # Simulated time for swarm runs.
+    # "realtime" sleeps so simulated time keeps pace with the wall clock (demos),
+    # "fast" just advances simulated time (batch runs). Timestamps always come
+    # from simulated time, so logs from both modes line up.
+    MODES = ("realtime", "fast")
+
+    def __init__(self, mode="realtime", start=None, speed=1.0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown clock mode '{mode}', expected one of {self.MODES}")
+        self.mode = mode
+        self.speed = speed
+        self.start = start or datetime.now(timezone.utc).replace(microsecond=0)
+        self.elapsed = 0.0
+        self._wall_start = time.monotonic()
+
+    def sleep(self, seconds):
+        self.elapsed += seconds
+        if self.mode == "realtime":
+            # Sleep until the wall clock catches up, so time spent computing
+            # the cycle counts towards the interval instead of adding to it
+            delay = self._wall_start + self.elapsed / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def now(self):
+        return self.start + timedelta(seconds=self.elapsed)
+
+    def timestamp(self):
+        return self.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,101 @@
+import csv
+import io
+import os
+
+# Column types of the rows produced by OzoneSwarmUnit.report
+OTS_LOG_FIELDS = {
+    "Cycle": int,
+    "Timestamp": str,
+    "Unit ID": str,
+    "Altitude (m)": int,
+    "Latitude": float,
+    "Longitude": float,
+    "Ozone Level (ppm)": float,
+    "CO₂ (ppm)": float,
+    "NOx (ppm)": float,
+    "Status": str,
+    "Payload Deployed": bool,
+    "Compound Deployed": bool,
+}
+
+
+class StreamingLogWriter:
+    # Chunked CSV sink for swarm telemetry.
+    # At most chunk_rows rows are held in memory; every full chunk is written
+    # and fsynced, so a crash loses at most one chunk and other processes can
+    # read the file (see read_complete_rows) while the run is still going.
+
+    def __init__(self, filename, fields=OTS_LOG_FIELDS, chunk_rows=1000):
+        self.filename = filename
+        self.fields = dict(fields)
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._buffer = []
+        self._file = open(filename, mode="w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fields)
+        self._sync()
+
+    def _coerce(self, value, kind):
+        if value is None:
+            return ""
+        return kind(value)
+
+    def write(self, row):
+        self._buffer.append(
+            [self._coerce(row.get(name), kind) for name, kind in self.fields.items()]
+        )
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def write_columns(self, columns):
+        # Write equal-length column arrays (e.g. from OzoneSwarmEngine) without
+        # building a dict per row; missing columns are left empty
+        self.flush()
+        length = max(len(values) for values in columns.values())
+        for start in range(0, length, self.chunk_rows):
+            stop = min(start + self.chunk_rows, length)
+            chunk = []
+            for name, kind in self.fields.items():
+                if name in columns:
+                    chunk.append([self._coerce(v, kind) for v in columns[name][start:stop]])
+                else:
+                    chunk.append([""] * (stop - start))
+            self._buffer.extend(zip(*chunk))
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        self._writer.writerows(self._buffer)
+        self.rows_written += len(self._buffer)
+        self._buffer.clear()
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_complete_rows(filename):
+    # Read a log that may still be written to, ignoring a trailing partial row
+    with open(filename, mode="r", newline="", encoding="utf-8") as file:
+        text = file.read()
+    end = text.rfind("\n")
+    return list(csv.DictReader(io.StringIO(text[:end + 1])))
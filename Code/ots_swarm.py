@@ -1,8 +1,10 @@
 import random
-import time
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from ots_clock import SimulationClock
+
 class OzoneSwarmUnit:
     def __init__(self, unit_id):
         self.unit_id = unit_id
@@ -37,8 +39,9 @@ class OzoneSwarmUnit:
         self.status = "Deploying ozone enhancer"
         self.payload_deployed = True
 
-    def report(self):
+    def report(self, timestamp=None):
         return {
+            "Timestamp": timestamp,
             "Unit ID": self.unit_id,
             "Altitude (m)": self.altitude,
             "Ozone Level (ppm)": self.ozone_level,
@@ -47,24 +50,29 @@ class OzoneSwarmUnit:
         }
 
 NUM_UNITS = 5
+# Pass --fast to skip the wall-clock waits between cycles
+CLOCK_MODE = "fast" if "--fast" in sys.argv else "realtime"
+clock = SimulationClock(CLOCK_MODE)
 swarm_units = [OzoneSwarmUnit(f"OTS-{i+1:03}") for i in range(NUM_UNITS)]
 
 for cycle in range(3):
     print(f"\n🌍 OTS SIMULATION CYCLE {cycle + 1} 🌍\n")
     for unit in swarm_units:
         gases = unit.analyze_and_act()
-        report = unit.report()
-        print(f"📡 {report['Unit ID']} @ {report['Altitude (m)']}m | "
+        report = unit.report(clock.timestamp())
+        print(f"📡 [{report['Timestamp']}] {report['Unit ID']} @ {report['Altitude (m)']}m | "
               f"O₃: {report['Ozone Level (ppm)']} ppm | "
               f"Status: {report['Status']} | Payload: {report['Payload Deployed']}")
-    time.sleep(1)
+    clock.sleep(1)
     print("\nGases Detected:")
     for unit in swarm_units:
         print(f"{unit.unit_id}: {unit.detect_gases()}")
-    time.sleep(2)
+    clock.sleep(2)
     print("End of Cycle\n")
-    plt.show()
-    time.sleep(1)
+    # The plot window blocks until closed; fast (batch) runs must not wait on it
+    if clock.mode == "realtime":
+        plt.show()
+    clock.sleep(1)
     plt.clf()
     plt.title("Ozone Levels Over Time")
     plt.xlabel("Year")
@@ -1,12 +1,20 @@
 import random
-import time
-import csv
+import sys
+
+from ots_clock import SimulationClock
+from ots_log_writer import StreamingLogWriter
+from spatial_grid import SpatialHashGrid, random_positions
 
 class OzoneSwarmUnit:
-    def __init__(self, unit_id):
+    def __init__(self, unit_id, lat=None, lon=None):
         self.unit_id = unit_id
         self.altitude = random.randint(8000, 15000)
         self.ozone_level = self.sense_ozone()
+        # Position over the globe, random unless given
+        if lat is None or lon is None:
+            lat, lon = random_positions(random)
+        self.lat = lat
+        self.lon = lon
         self.status = "Idle"
         self.payload_deployed = False
         self.compound_deployed = False
@@ -45,7 +53,10 @@ class OzoneSwarmUnit:
     def analyze_and_act(self):
         gases = self.detect_gases()
         self.update_ozone(gases)
+        self.decide()
+        return gases
 
+    def decide(self):
         if self.ozone_level < 2.5 and not self.payload_deployed:
             self.deploy_payload()
         elif self.ozone_level < 3.0 and not self.compound_deployed:
@@ -53,8 +64,6 @@ class OzoneSwarmUnit:
         else:
             self.status = "Monitoring"
 
-        return gases
-
     def deploy_payload(self):
         self.status = "Deploying ozone enhancer"
         self.payload_deployed = True
@@ -64,11 +73,14 @@ class OzoneSwarmUnit:
         self.compound_deployed = True
         self.restoration_cycles_remaining = 3
 
-    def report(self, cycle, gases):
+    def report(self, cycle, gases, timestamp=None):
         return {
             "Cycle": cycle + 1,
+            "Timestamp": timestamp,
             "Unit ID": self.unit_id,
             "Altitude (m)": self.altitude,
+            "Latitude": self.lat,
+            "Longitude": self.lon,
             "Ozone Level (ppm)": self.ozone_level,
             "CO₂ (ppm)": gases["CO₂"],
             "NOx (ppm)": gases["NOx"],
@@ -77,28 +89,105 @@ class OzoneSwarmUnit:
             "Compound Deployed": self.compound_deployed
         }
 
-# Simulation Setup
-NUM_UNITS = 5
-NUM_CYCLES = 5
-FILENAME = "ots_swarm_log.csv"
-swarm_units = [OzoneSwarmUnit(f"OTS-{i+1:03}") for i in range(NUM_UNITS)]
-log_data = []
-
-# Simulation Loop
-for cycle in range(NUM_CYCLES):
-    print(f"\n🌍 OTS SIMULATION CYCLE {cycle + 1} 🌍\n")
-    for unit in swarm_units:
-        gases = unit.analyze_and_act()
-        report = unit.report(cycle, gases)
-        print(f"📡 {report['Unit ID']} @ {report['Altitude (m)']}m | "
-              f"O₃: {report['Ozone Level (ppm)']} ppm | "
-              f"Status: {report['Status']} | "
-              f"Payload: {report['Payload Deployed']} | "
-              f"Compound: {report['Compound Deployed']}")
-        log_data.append(report)
-    time.sleep(1)
-with open(FILENAME, mode="w", newline="") as file:
-    writer = csv.DictWriter(file, fieldnames=log_data[0].keys())
-    writer.writerows(log_data)
-
-print(f"\n✅ Data saved to {FILENAME}")
\ No newline at end of file
+def log_report(report, log):
+    print(f"📡 {report['Unit ID']} @ {report['Altitude (m)']}m | "
+          f"O₃: {report['Ozone Level (ppm)']} ppm | "
+          f"Status: {report['Status']} | "
+          f"Payload: {report['Payload Deployed']} | "
+          f"Compound: {report['Compound Deployed']}")
+    log.write(report)
+
+def deconflict(units, grid, radius_km, was_deployed):
+    # Stand down units that started spraying this cycle within radius_km of a
+    # unit that is spraying already (or of a lower-numbered unit that also
+    # just started); returns how many. Pairs come from the grid, so this is
+    # proportional to the units nearby, not n².
+    grid.rebuild([unit.lat for unit in units], [unit.lon for unit in units])
+    first, second = grid.pairs_within(radius_km)
+    stood_down = 0
+    for j, i in sorted(zip(second.tolist(), first.tolist())):
+        if not (units[i].payload_deployed and units[j].payload_deployed):
+            continue
+        new = [k for k in (i, j) if not was_deployed[k]]
+        if not new:
+            continue
+        unit = units[max(new)]
+        unit.payload_deployed = False
+        unit.status = "Standing down"
+        stood_down += 1
+    return stood_down
+
+def run_cycle(units, cycle, clock, log, metrics=None, grid=None, spray_radius_km=None):
+    # With a grid and spray_radius_km, nearby units do not start spraying
+    # the same area in the same cycle (see deconflict)
+    deconflicting = grid is not None and spray_radius_km is not None
+    if metrics is None:
+        was_deployed = [unit.payload_deployed for unit in units]
+        readings = [unit.analyze_and_act() for unit in units]
+        if deconflicting:
+            deconflict(units, grid, spray_radius_km, was_deployed)
+        for unit, gases in zip(units, readings):
+            log_report(unit.report(cycle, gases, clock.timestamp()), log)
+        return
+
+    # Same work phase by phase, so each phase can be timed; only sensing
+    # draws random numbers, so the results are identical
+    metrics.start_cycle(cycle + 1, len(units))
+    with metrics.phase("sense"):
+        readings = [unit.detect_gases() for unit in units]
+    with metrics.phase("predict"):
+        for unit, gases in zip(units, readings):
+            unit.update_ozone(gases)
+    before = [(unit.status, unit.payload_deployed, unit.compound_deployed) for unit in units]
+    with metrics.phase("decide"):
+        for unit in units:
+            unit.decide()
+    if deconflicting:
+        with metrics.phase("deconflict"):
+            metrics.count("stood_down", deconflict(units, grid, spray_radius_km,
+                                                   [payload for _, payload, _ in before]))
+    # Counted from the final state of the cycle; payload_deployed counts new
+    # deployments only, as in SwarmSimulation
+    for unit, (status, payload, compound) in zip(units, before):
+        metrics.transition(status, unit.status)
+        if unit.payload_deployed and not payload:
+            metrics.count("payload_deployed")
+        if unit.compound_deployed and not compound:
+            metrics.count("compound_released")
+    with metrics.phase("log"):
+        for unit, gases in zip(units, readings):
+            log_report(unit.report(cycle, gases, clock.timestamp()), log)
+    metrics.end_cycle()
+
+if __name__ == "__main__":
+    # Simulation Setup
+    NUM_UNITS = 5
+    NUM_CYCLES = 5
+    FILENAME = "ots_swarm_log.csv"
+    CYCLE_SECONDS = 1
+    # Units closer than this do not start spraying in the same cycle
+    SPRAY_RADIUS_KM = 500
+    # Pass --fast to skip the wall-clock waits between cycles
+    CLOCK_MODE = "fast" if "--fast" in sys.argv else "realtime"
+    clock = SimulationClock(CLOCK_MODE)
+    swarm_units = [OzoneSwarmUnit(f"OTS-{i+1:03}") for i in range(NUM_UNITS)]
+    grid = SpatialHashGrid()
+
+    # Pass --metrics to record per-cycle timings and counters
+    metrics = None
+    if "--metrics" in sys.argv:
+        from swarm_metrics import SwarmMetrics
+        metrics = SwarmMetrics("ots_swarm_metrics.jsonl", profile_every=0, trace_memory=False)
+
+    # Simulation Loop
+    with StreamingLogWriter(FILENAME) as log:
+        for cycle in range(NUM_CYCLES):
+            print(f"\n🌍 OTS SIMULATION CYCLE {cycle + 1} 🌍\n")
+            run_cycle(swarm_units, cycle, clock, log, metrics, grid, SPRAY_RADIUS_KM)
+            clock.sleep(CYCLE_SECONDS)
+
+    print(f"\n✅ Data saved to {FILENAME}")
+    if metrics is not None:
+        metrics.close()
+        metrics.write_prometheus("ots_swarm_metrics.prom")
+        print("📈 Metrics saved to ots_swarm_metrics.jsonl and ots_swarm_metrics.prom")
@@ -0,0 +1,83 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from ozone_trends import DEFAULT_CELL_DEG, IncrementalTrend
+
+SIMULATED_VERSION = "simulated-seed42-n1000"
+
+
+def simulate_ozone_data(seed=42, size=1000):
+    # Same simulated readings the dashboards have always used
+    rng = np.random.RandomState(seed)
+    years = rng.choice(range(2000, 2025), size=size)
+    latitudes = rng.uniform(-90, 90, size)
+    longitudes = rng.uniform(-180, 180, size)
+    ozone_values = rng.normal(loc=300, scale=40, size=size)
+
+    ozone_df = pd.DataFrame({
+        'year': years,
+        'latitude': latitudes,
+        'longitude': longitudes,
+        'ozone_du': ozone_values
+    })
+    ozone_df['damage_zone'] = ozone_df['ozone_du'] < 220
+    return ozone_df
+
+
+class OzoneDataset:
+    # Read-only view of the ozone readings for the dashboards.
+    # Rows are partitioned by year once (a stable sort plus year -> slice
+    # index), and derived results are memoized on the instance. Cache the
+    # instance by its version (see load_dataset) and a rerun only
+    # redoes the work that depends on the selected year.
+
+    def __init__(self, df, version):
+        self.df = df
+        self.version = version
+        order = np.argsort(df['year'].to_numpy(), kind='stable')
+        self._by_year = df.iloc[order]
+        years = self._by_year['year'].to_numpy()
+        unique_years, starts = np.unique(years, return_index=True)
+        ends = np.append(starts[1:], len(years))
+        self._slices = {int(y): slice(s, e) for y, s, e in zip(unique_years, starts, ends)}
+        self._memo = {}
+
+    @property
+    def years(self):
+        return list(self._slices)
+
+    @property
+    def year_range(self):
+        return min(self._slices), max(self._slices)
+
+    def for_year(self, year):
+        # Rows for one year, in their original order
+        return self._by_year.iloc[self._slices.get(int(year), slice(0, 0))]
+
+    def _memoize(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def trend(self):
+        return self._memoize("trend", lambda: self.df.groupby('year')['ozone_du'].mean().reset_index())
+
+    def trends(self, cell_deg=DEFAULT_CELL_DEG):
+        # Global and per-cell linear trends from running sums; new readings
+        # can be added with update() without refitting
+        def build():
+            engine = IncrementalTrend(cell_deg=cell_deg)
+            engine.update_many(self.df['year'], self.df['latitude'], self.df['longitude'],
+                               self.df['ozone_du'])
+            return engine
+        return self._memoize(("trends", cell_deg), build)
+
+
+def load_dataset(version=SIMULATED_VERSION):
+    match = re.fullmatch(r"simulated-seed(\d+)-n(\d+)", version)
+    if not match:
+        raise ValueError(f"Unknown ozone dataset version '{version}'")
+    seed, size = map(int, match.groups())
+    return OzoneDataset(simulate_ozone_data(seed, size), version)
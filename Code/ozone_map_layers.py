@@ -0,0 +1,180 @@
+import folium
+import numpy as np
+
+# Point counts at which rendering switches to a cheaper mode
+MARKER_LIMIT = 500
+GEOJSON_LIMIT = 5000
+# Grid cell sizes (degrees) tried when aggregating, finest first
+CELL_SIZES = (0.5, 1, 2, 5, 10, 15, 30)
+
+
+def choose_render_mode(num_points, marker_limit=MARKER_LIMIT, geojson_limit=GEOJSON_LIMIT):
+    if num_points <= marker_limit:
+        return "markers"
+    if num_points <= geojson_limit:
+        return "geojson"
+    return "grid"
+
+
+def zone_color(damage):
+    return 'red' if damage else 'blue'
+
+
+def add_ozone_points(m, df, mode="auto", marker_limit=MARKER_LIMIT,
+                     geojson_limit=GEOJSON_LIMIT, max_cells=1000):
+    # Draw ozone readings (latitude, longitude, ozone_du, year, damage_zone) on
+    # a folium map. "auto" keeps individual markers for small years, one
+    # GeoJSON layer for medium ones and pre-aggregated grid cells beyond that.
+    if mode == "auto":
+        mode = choose_render_mode(len(df), marker_limit, geojson_limit)
+    if mode == "markers":
+        add_point_markers(m, df)
+    elif mode == "geojson":
+        add_point_layer(m, df)
+    elif mode == "grid":
+        add_grid_layer(m, df, max_cells=max_cells)
+    else:
+        raise ValueError(f"Unknown render mode '{mode}'")
+    return mode
+
+
+def add_point_markers(m, df):
+    for row in df.itertuples(index=False):
+        color = zone_color(row.damage_zone)
+        folium.CircleMarker(
+            location=[row.latitude, row.longitude],
+            radius=4,
+            color=color,
+            fill=True,
+            fill_color=color,
+            fill_opacity=0.6,
+            popup=f"Ozone: {row.ozone_du:.1f} DU (Year: {row.year})"
+        ).add_to(m)
+
+
+def add_point_layer(m, df):
+    # All points as one GeoJSON layer: a single compact payload instead of a
+    # block of JavaScript per marker
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [round(float(lon), 4), round(float(lat), 4)]},
+            "properties": {
+                "damage": bool(damage),
+                "label": f"Ozone: {ozone:.1f} DU (Year: {year})",
+            },
+        }
+        for lat, lon, ozone, year, damage in zip(
+            df['latitude'].to_numpy(), df['longitude'].to_numpy(),
+            df['ozone_du'].to_numpy(), df['year'].to_numpy(), df['damage_zone'].to_numpy()
+        )
+    ]
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name="Ozone readings",
+        marker=folium.CircleMarker(radius=4, fill=True, fill_opacity=0.6),
+        style_function=lambda feature: {
+            "color": zone_color(feature["properties"]["damage"]),
+            "fillColor": zone_color(feature["properties"]["damage"]),
+        },
+        popup=folium.GeoJsonPopup(fields=["label"], labels=False),
+    ).add_to(m)
+
+
+def aggregate_grid(df, max_cells=1000):
+    # Bin readings into lat/lon cells, picking the finest cell size that keeps
+    # the number of occupied cells within max_cells
+    lat = df['latitude'].to_numpy()
+    lon = df['longitude'].to_numpy()
+    for cell_deg in CELL_SIZES:
+        rows = np.floor((lat + 90) / cell_deg).astype(np.int64)
+        cols = np.floor((lon + 180) / cell_deg).astype(np.int64)
+        cell_ids, inverse = np.unique(rows * 100000 + cols, return_inverse=True)
+        if len(cell_ids) <= max_cells:
+            break
+
+    counts = np.bincount(inverse)
+    mean_ozone = np.bincount(inverse, weights=df['ozone_du'].to_numpy()) / counts
+    damage = np.bincount(inverse, weights=df['damage_zone'].to_numpy().astype(float))
+    return {
+        "cell_deg": cell_deg,
+        "south": (cell_ids // 100000) * cell_deg - 90,
+        "west": (cell_ids % 100000) * cell_deg - 180,
+        "count": counts,
+        "mean_ozone": mean_ozone,
+        "damage_count": damage.astype(int),
+    }
+
+
+def add_grid_layer(m, df, max_cells=1000):
+    grid = aggregate_grid(df, max_cells=max_cells)
+    size = grid["cell_deg"]
+    max_count = grid["count"].max() if len(grid["count"]) else 1
+    features = []
+    for south, west, count, ozone, damage in zip(grid["south"].tolist(), grid["west"].tolist(),
+                                                 grid["count"].tolist(), grid["mean_ozone"].tolist(),
+                                                 grid["damage_count"].tolist()):
+        north, east = min(south + size, 90), min(west + size, 180)
+        features.append({
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[west, south], [east, south], [east, north],
+                                 [west, north], [west, south]]],
+            },
+            "properties": {
+                "damage": bool(damage),
+                "opacity": round(0.2 + 0.6 * np.log1p(count) / np.log1p(max_count), 2),
+                "label": f"{count} readings | Mean ozone: {ozone:.1f} DU | Damage zones: {damage}",
+            },
+        })
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name=f"Ozone readings ({size}° grid)",
+        style_function=lambda feature: {
+            "color": zone_color(feature["properties"]["damage"]),
+            "weight": 0.5,
+            "fillColor": zone_color(feature["properties"]["damage"]),
+            "fillOpacity": feature["properties"]["opacity"],
+        },
+        tooltip=folium.GeoJsonTooltip(fields=["label"], labels=False),
+    ).add_to(m)
+
+
+def add_trend_layer(m, trends, year, min_readings=5):
+    # Grid cells of an IncrementalTrend: green where ozone is recovering,
+    # red where it is declining, stronger colour for steeper trends
+    slopes = trends.cell_slopes()
+    predicted = trends.cell_predict(year)
+    counts = trends.cell_counts()
+    shown = np.isfinite(slopes) & (counts >= min_readings)
+    steepest = np.abs(slopes[shown]).max() if shown.any() else 1.0
+    features = []
+    for row, col in zip(*np.nonzero(shown)):
+        south, west, north, east = trends.cell_bounds(int(row), int(col))
+        slope = float(slopes[row, col])
+        features.append({
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[west, south], [east, south], [east, north],
+                                 [west, north], [west, south]]],
+            },
+            "properties": {
+                "color": 'green' if slope > 0 else 'red',
+                "opacity": round(0.15 + 0.6 * abs(slope) / steepest, 2),
+                "label": (f"Trend: {slope:+.2f} DU/yr | {year}: {predicted[row, col]:.1f} DU"
+                          f" | {int(counts[row, col])} readings"),
+            },
+        })
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name=f"Ozone trends ({trends.cell_deg}° cells)",
+        style_function=lambda feature: {
+            "color": feature["properties"]["color"],
+            "weight": 0.5,
+            "fillColor": feature["properties"]["color"],
+            "fillOpacity": feature["properties"]["opacity"],
+        },
+        tooltip=folium.GeoJsonTooltip(fields=["label"], labels=False),
+    ).add_to(m)
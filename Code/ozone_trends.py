@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+
+# Sufficient statistics kept per series: n, Σx, Σy, Σx², Σxy, Σy²
+N, SX, SY, SXX, SXY, SYY = range(6)
+# Grid cell size (degrees) used by IncrementalTrend and OzoneDataset.trends
+DEFAULT_CELL_DEG = 30
+
+
+class IncrementalTrend:
+    # Linear ozone-vs-year trends kept as running sufficient statistics, for
+    # the global series and for every lat/lon grid cell. Adding observations
+    # never refits anything: a new reading updates six sums in O(1), and the
+    # least-squares line of every cell falls out of the sums in one vectorized
+    # step. Years are centred on ref_year to keep the sums well conditioned.
+
+    def __init__(self, cell_deg=DEFAULT_CELL_DEG, ref_year=2000):
+        self.cell_deg = cell_deg
+        self.ref_year = ref_year
+        self.shape = (math.ceil(180 / cell_deg), math.ceil(360 / cell_deg))
+        self.cells = np.zeros((6, self.shape[0] * self.shape[1]))
+        self.totals = np.zeros(6)
+
+    def _cell(self, lat, lon):
+        row = np.clip(np.floor((np.asarray(lat) + 90) / self.cell_deg).astype(int), 0, self.shape[0] - 1)
+        col = np.clip(np.floor((np.asarray(lon) + 180) / self.cell_deg).astype(int), 0, self.shape[1] - 1)
+        return row * self.shape[1] + col
+
+    @staticmethod
+    def _terms(x, y):
+        return (np.ones_like(x), x, y, x * x, x * y, y * y)
+
+    def update(self, year, lat, lon, value):
+        # One observation, O(1)
+        x = float(year - self.ref_year)
+        terms = (1.0, x, value, x * x, x * value, value * value)
+        cell = int(self._cell(lat, lon))
+        for k, term in enumerate(terms):
+            self.cells[k, cell] += term
+            self.totals[k] += term
+
+    def update_many(self, years, lats, lons, values):
+        x = np.asarray(years, dtype=float) - self.ref_year
+        y = np.asarray(values, dtype=float)
+        cells = self._cell(lats, lons)
+        for k, term in enumerate(self._terms(x, y)):
+            self.cells[k] += np.bincount(cells, weights=term, minlength=self.cells.shape[1])
+            self.totals[k] += term.sum()
+
+    @staticmethod
+    def _fit(stats):
+        # Least-squares slope/intercept from the sums; NaN where a series has
+        # fewer than two distinct years
+        n, sx, sy, sxx, sxy = stats[N], stats[SX], stats[SY], stats[SXX], stats[SXY]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = n * sxx - sx * sx
+            slope = np.where(denom > 0, (n * sxy - sx * sy) / denom, np.nan)
+            intercept = (sy - slope * sx) / n
+        return slope, intercept
+
+    def global_fit(self):
+        # (slope per year, intercept at ref_year)
+        slope, intercept = self._fit(self.totals)
+        return float(slope), float(intercept)
+
+    def global_predict(self, years):
+        slope, intercept = self.global_fit()
+        return intercept + slope * (np.asarray(years, dtype=float) - self.ref_year)
+
+    def global_mse(self):
+        # In-sample mean squared error of the global line, from the sums alone
+        slope, intercept = self.global_fit()
+        n, sx, sy, sxx, sxy, syy = self.totals
+        sse = (syy - 2 * intercept * sy - 2 * slope * sxy + intercept ** 2 * n
+               + 2 * intercept * slope * sx + slope ** 2 * sxx)
+        return max(sse, 0.0) / n
+
+    def cell_slopes(self):
+        # (rows, cols) grid of DU-per-year trends
+        slope, _ = self._fit(self.cells)
+        return slope.reshape(self.shape)
+
+    def cell_predict(self, year):
+        # (rows, cols) grid of predicted DU for `year`, one vectorized query
+        slope, intercept = self._fit(self.cells)
+        return (intercept + slope * (year - self.ref_year)).reshape(self.shape)
+
+    def cell_counts(self):
+        return self.cells[N].reshape(self.shape)
+
+    def cell_bounds(self, row, col):
+        # (south, west, north, east) of a grid cell
+        south, west = row * self.cell_deg - 90, col * self.cell_deg - 180
+        return south, west, min(south + self.cell_deg, 90), min(west + self.cell_deg, 180)
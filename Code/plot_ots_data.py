@@ -1,11 +1,15 @@
+import argparse
+import os
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-def load_and_clean_csv(ots_swarm_log.csv):
+def load_and_clean_csv(filename):
     try:
-        df = pd.read_csv(ots_swarm_log.csv, skipinitialspace=True)
+        df = pd.read_csv(filename, skipinitialspace=True)
     except FileNotFoundError:
-        print(f"Error: CSV file '{ots_swarm_log.csv}' not found. Check the filename and path.")
+        print(f"Error: CSV file '{filename}' not found. Check the filename and path.")
         exit(1)
     except pd.errors.ParserError as e:
         print(f"Error parsing CSV file: {e}")
@@ -61,10 +65,102 @@ def plot_ots_data(df):
     plt.grid(True)
     plt.show()
 
+def lttb(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: indices of `threshold` points that keep
+    # the visual shape of the series (peaks and dips survive)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        avg_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def bucket_frame(frame, max_points, how):
+    # Reduce a per-cycle frame to at most max_points rows; `how` maps each
+    # column to its bucket aggregate (e.g. min for a lower band, max for an upper one)
+    if len(frame) <= max_points:
+        return frame
+    buckets = np.arange(len(frame)) * max_points // len(frame)
+    return frame.groupby(buckets).agg({"Cycle": "mean", **how})
+
+def plot_ots_data_batch(df, out_dir="plots", max_points=500, max_units=20):
+    # Headless plots for large runs, written to out_dir. Rows are grouped once;
+    # each unit's series is LTTB-downsampled to max_points, and beyond
+    # max_units units the swarm is summarized as percentile bands instead.
+    plt.switch_backend("Agg")
+    os.makedirs(out_dir, exist_ok=True)
+    df = df.sort_values(['Unit ID', 'Cycle'], kind='stable')
+    units = df['Unit ID'].unique()
+    paths = []
+
+    # Ozone levels
+    fig, ax = plt.subplots(figsize=(12, 6))
+    if len(units) <= max_units:
+        for unit, unit_data in df.groupby('Unit ID', sort=False):
+            cycles = unit_data['Cycle'].to_numpy(dtype=float)
+            ozone = unit_data['Ozone Level (ppm)'].to_numpy(dtype=float)
+            keep = lttb(cycles, ozone, max_points)
+            ax.plot(cycles[keep], ozone[keep], linewidth=1, label=unit)
+        ax.legend()
+    else:
+        bands = df.groupby('Cycle')['Ozone Level (ppm)'].quantile([0.05, 0.25, 0.5, 0.75, 0.95])
+        bands = bands.unstack().reset_index()
+        bands = bucket_frame(bands, max_points, {0.05: "min", 0.25: "min", 0.5: "mean", 0.75: "max", 0.95: "max"})
+        ax.fill_between(bands['Cycle'], bands[0.05], bands[0.95], alpha=0.2, color='tab:blue', label="5–95%")
+        ax.fill_between(bands['Cycle'], bands[0.25], bands[0.75], alpha=0.4, color='tab:blue', label="25–75%")
+        ax.plot(bands['Cycle'], bands[0.5], color='tab:blue', linewidth=1.5, label="Median")
+        ax.legend(title=f"{len(units)} units")
+    ax.set_title("Ozone Levels per Swarm Unit Over Cycles")
+    ax.set_xlabel("Simulation Cycle")
+    ax.set_ylabel("Ozone Level (ppm)")
+    ax.grid(True)
+    paths.append(os.path.join(out_dir, "ozone_levels.png"))
+    fig.savefig(paths[-1], dpi=120, bbox_inches="tight")
+    plt.close(fig)
+
+    # Share of units with payload / compound deployed per cycle
+    fig, ax = plt.subplots(figsize=(12, 6))
+    deployed = df.groupby('Cycle')[['Payload Deployed', 'Compound Deployed']].mean().reset_index()
+    deployed = bucket_frame(deployed, max_points, {'Payload Deployed': "mean", 'Compound Deployed': "mean"})
+    ax.plot(deployed['Cycle'], deployed['Payload Deployed'], color='red', label="Payload")
+    ax.plot(deployed['Cycle'], deployed['Compound Deployed'], color='blue', label="Compound")
+    ax.set_title("Share of Units with Payload and Compound Deployed Over Cycles")
+    ax.set_xlabel("Simulation Cycle")
+    ax.set_ylabel("Share of Swarm Units")
+    ax.set_ylim(0, 1)
+    ax.legend(loc="upper right")
+    ax.grid(True)
+    paths.append(os.path.join(out_dir, "deployments.png"))
+    fig.savefig(paths[-1], dpi=120, bbox_inches="tight")
+    plt.close(fig)
+
+    return paths
+
 def main():
-    filename = "ots_swarm_log.csv"
-    df = load_and_clean_csv(filename)
-    plot_ots_data(df)
+    parser = argparse.ArgumentParser(description="Plot an OTS swarm log")
+    parser.add_argument("filename", nargs="?", default="ots_swarm_log.csv")
+    parser.add_argument("--batch", action="store_true", help="render headlessly to files")
+    parser.add_argument("--out-dir", default="plots")
+    parser.add_argument("--max-points", type=int, default=500)
+    parser.add_argument("--max-units", type=int, default=20)
+    args = parser.parse_args()
+
+    df = load_and_clean_csv(args.filename)
+    if args.batch:
+        for path in plot_ots_data_batch(df, args.out_dir, args.max_points, args.max_units):
+            print(f"Saved {path}")
+    else:
+        plot_ots_data(df)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,162 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SpatialHashGrid:
+    # Uniform lat/lon grid over unit positions for neighbour queries.
+    # rebuild() hashes every position into its cell in one vectorized pass
+    # (call it once per cycle after units move); only occupied cells are
+    # stored, as runs of a key-sorted order. Radius queries only look at the
+    # cells a spherical cap of that radius can reach, so "units within R" is
+    # proportional to the units nearby rather than to the swarm size.
+
+    def __init__(self, cell_km=250.0):
+        self.cell_km = cell_km
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.rows = math.ceil(180 / self.cell_deg)
+        self.cols = math.ceil(360 / self.cell_deg)
+        self.rebuild([], [])
+
+    def _rows_cols(self, lats, lons):
+        rows = np.clip(((np.asarray(lats, dtype=float) + 90) // self.cell_deg).astype(np.int64),
+                       0, self.rows - 1)
+        cols = (((np.asarray(lons, dtype=float) + 180) // self.cell_deg).astype(np.int64)) % self.cols
+        return rows, cols
+
+    def rebuild(self, lats, lons):
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        rows, cols = self._rows_cols(self.lats, self.lons)
+        keys = rows * self.cols + cols
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, starts = np.unique(keys[self.order], return_index=True)
+        self.starts = np.append(starts, len(keys))
+
+    def __len__(self):
+        return len(self.lats)
+
+    def _members(self, keys):
+        # Unit indices in the given cells
+        keys = np.asarray(keys, dtype=np.int64)
+        pos = np.searchsorted(self.keys, keys)
+        pos = pos[(pos < len(self.keys)) & (self.keys[np.minimum(pos, len(self.keys) - 1)] == keys)]
+        if not len(pos):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.order[self.starts[p]:self.starts[p + 1]] for p in pos])
+
+    def _reach(self, lat_lo, lat_hi, radius_km):
+        # Cell keys that may hold points within radius_km of the band
+        # [lat_lo, lat_hi] (all columns) -- narrowed by column later
+        angle = radius_km / EARTH_RADIUS_KM
+        row_lo = max(0, int((lat_lo - math.degrees(angle) + 90) // self.cell_deg))
+        row_hi = min(self.rows - 1, int((lat_hi + math.degrees(angle) + 90) // self.cell_deg))
+        # Widest longitude reach of a cap of this radius within the band
+        edge = max(abs(lat_lo), abs(lat_hi))
+        if math.degrees(angle) + edge >= 90 or math.sin(angle) >= math.cos(math.radians(edge)):
+            dlon = 180.0
+        else:
+            dlon = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(edge))))
+        return row_lo, row_hi, dlon
+
+    def _cells(self, row_lo, row_hi, lon_lo, lon_hi):
+        if lon_hi - lon_lo >= 360 - self.cell_deg:
+            cols = np.arange(self.cols)
+        else:
+            # Split a span crossing the antimeridian into its two sides
+            spans = [(lon_lo, lon_hi)]
+            if lon_lo < -180:
+                spans = [(lon_lo + 360, 180), (-180, lon_hi)]
+            elif lon_hi >= 180:
+                spans = [(lon_lo, 180), (-180, lon_hi - 360)]
+            cols = np.concatenate([
+                np.arange(int((lo + 180) // self.cell_deg), int((hi + 180) // self.cell_deg) + 1)
+                for lo, hi in spans
+            ])
+            cols = np.unique(np.minimum(cols, self.cols - 1))
+        rows = np.arange(row_lo, row_hi + 1)
+        return (rows[:, None] * self.cols + cols[None, :]).ravel()
+
+    def within(self, lat, lon, radius_km):
+        # (indices, distances_km) of units within radius_km of a point, nearest first
+        row_lo, row_hi, dlon = self._reach(lat, lat, radius_km)
+        candidates = self._members(self._cells(row_lo, row_hi, lon - dlon, lon + dlon))
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        keep = distances <= radius_km
+        candidates, distances = candidates[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
+
+    def pairs_within(self, radius_km):
+        # All unit pairs (i, j), i < j, closer than radius_km, as two arrays.
+        # Works one latitude row at a time: the row's units are matched
+        # against the longitude-sorted units of every row in reach through
+        # binary-searched windows, then checked with one vectorized distance.
+        point_rows, _ = self._rows_cols(self.lats, self.lons)
+        by_row = np.lexsort((self.lons, point_rows))
+        sorted_rows = point_rows[by_row]
+        first, second = [], []
+        for row in np.unique(sorted_rows):
+            lat_lo = row * self.cell_deg - 90
+            row_lo, row_hi, dlon = self._reach(lat_lo, min(lat_lo + self.cell_deg, 90), radius_km)
+            members = by_row[np.searchsorted(sorted_rows, row):np.searchsorted(sorted_rows, row, "right")]
+            band = by_row[np.searchsorted(sorted_rows, row_lo):np.searchsorted(sorted_rows, row_hi, "right")]
+            band = band[np.argsort(self.lons[band], kind="stable")]
+            if dlon >= 180:
+                counts = np.full(len(members), len(band))
+                starts = np.zeros(len(members), dtype=np.int64)
+                candidates = band
+            else:
+                # Copies shifted by ±360° so windows can cross the antimeridian
+                candidates = np.concatenate([band, band, band])
+                lons = np.concatenate([self.lons[band] - 360, self.lons[band], self.lons[band] + 360])
+                starts = np.searchsorted(lons, self.lons[members] - dlon, "left")
+                counts = np.searchsorted(lons, self.lons[members] + dlon, "right") - starts
+            i = np.repeat(members, counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = candidates[np.repeat(starts, counts) + offsets]
+            keep = i < j
+            i, j = i[keep], j[keep]
+            keep = haversine_km(self.lats[i], self.lons[i], self.lats[j], self.lons[j]) <= radius_km
+            first.append(i[keep])
+            second.append(j[keep])
+        if not first:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(first), np.concatenate(second)
+
+    def coverage(self):
+        # {(row, col): units} for every occupied cell
+        counts = np.diff(self.starts)
+        return {divmod(int(key), self.cols): int(n) for key, n in zip(self.keys, counts)}
+
+    def covered_fraction(self):
+        # Share of the globe's surface area in cells holding at least one unit
+        rows = self.keys // self.cols
+        south = np.radians(rows * self.cell_deg - 90)
+        north = np.radians(np.minimum(rows * self.cell_deg - 90 + self.cell_deg, 90))
+        width = np.radians(self.cell_deg) / (2 * np.pi)
+        return float(np.sum((np.sin(north) - np.sin(south)) / 2 * width))
+
+    def cell_bounds(self, row, col):
+        # (south, west, north, east) of a grid cell
+        south, west = row * self.cell_deg - 90, col * self.cell_deg - 180
+        return south, west, min(south + self.cell_deg, 90), min(west + self.cell_deg, 180)
+
+
+def random_positions(rng, n=None):
+    # Lat/lon spread evenly over the sphere (uniform in sin(latitude)), from an
+    # object with uniform(); one position when n is None
+    if n is None:
+        return math.degrees(math.asin(rng.uniform(-1, 1))), rng.uniform(-180, 180)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    return lats, rng.uniform(-180, 180, n)
@@ -0,0 +1,185 @@
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+
+# Phases timed in every instrumented cycle
+PHASES = ("sense", "predict", "decide", "log")
+PROFILE_TOP = 15  # functions kept from each cProfile sample
+
+
+class SwarmMetrics:
+    # Per-cycle instrumentation for the swarm simulation loops.
+    # A loop brackets each cycle with start_cycle()/end_cycle(), wraps its
+    # phases in phase(name) and reports deployments and status changes with
+    # count()/transition(). Every finished cycle becomes one record, written
+    # as a JSON line when jsonl_path is set; totals over the whole run are
+    # available in Prometheus text format.
+    #
+    # profile_every=N runs cProfile over every Nth cycle, trace_memory=True
+    # records tracemalloc current/peak bytes per cycle. Loops that get no
+    # metrics object skip all of this (see the `metrics is None` checks).
+
+    def __init__(self, jsonl_path=None, profile_every=0, trace_memory=False):
+        self.jsonl_path = jsonl_path
+        self.profile_every = profile_every
+        self.trace_memory = trace_memory
+        self.phase_seconds = Counter()
+        self.counters = Counter()
+        self.transitions = Counter()
+        self.cycles = 0
+        self.cycle_seconds = 0.0
+        self.last_record = None
+        self._jsonl = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+        self._cycle = None
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    # --- recording ---
+
+    def start_cycle(self, cycle, units):
+        self._cycle = {
+            "cycle": cycle,
+            "units": units,
+            "phases": Counter(),
+            "counters": Counter(),
+            "transitions": Counter(),
+            "profiler": None,
+            "start": time.perf_counter(),
+        }
+        if self.profile_every and cycle % self.profile_every == 0:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            self._cycle["profiler"] = profiler
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+    def phase(self, name):
+        return _PhaseTimer(self._cycle["phases"], name)
+
+    def count(self, name, n=1):
+        self._cycle["counters"][name] += n
+
+    def transition(self, old, new):
+        if old != new:
+            self._cycle["transitions"][(old, new)] += 1
+
+    def end_cycle(self):
+        cycle = self._cycle
+        self._cycle = None
+        duration = time.perf_counter() - cycle["start"]
+        profiler = cycle["profiler"]
+        if profiler is not None:
+            profiler.disable()
+
+        self.cycles += 1
+        self.cycle_seconds += duration
+        self.phase_seconds.update(cycle["phases"])
+        self.counters.update(cycle["counters"])
+        self.transitions.update(cycle["transitions"])
+
+        record = {
+            "cycle": cycle["cycle"],
+            "units": cycle["units"],
+            "seconds": duration,
+            "phases": dict(cycle["phases"]),
+            "counters": dict(cycle["counters"]),
+            "transitions": {f"{old} -> {new}": n for (old, new), n in cycle["transitions"].items()},
+        }
+        if profiler is not None:
+            record["profile"] = profile_summary(profiler)
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record["memory"] = {"current_bytes": current, "peak_bytes": peak}
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(record) + "\n")
+            self._jsonl.flush()
+        self.last_record = record
+        return record
+
+    def close(self):
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+    # --- export ---
+
+    def prometheus_text(self, prefix="ots_swarm"):
+        # Run totals in the Prometheus text exposition format
+        lines = [
+            f"# HELP {prefix}_cycles_total Simulation cycles completed.",
+            f"# TYPE {prefix}_cycles_total counter",
+            f"{prefix}_cycles_total {self.cycles}",
+            f"# HELP {prefix}_cycle_seconds_total Wall time spent in cycles.",
+            f"# TYPE {prefix}_cycle_seconds_total counter",
+            f"{prefix}_cycle_seconds_total {self.cycle_seconds:.9f}",
+            f"# HELP {prefix}_phase_seconds_total Wall time spent per cycle phase.",
+            f"# TYPE {prefix}_phase_seconds_total counter",
+        ]
+        lines += [f'{prefix}_phase_seconds_total{{phase="{_label(name)}"}} {seconds:.9f}'
+                  for name, seconds in sorted(self.phase_seconds.items())]
+        lines += [
+            f"# HELP {prefix}_events_total Unit events such as deployments.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        lines += [f'{prefix}_events_total{{event="{_label(name)}"}} {n}'
+                  for name, n in sorted(self.counters.items())]
+        lines += [
+            f"# HELP {prefix}_transitions_total Unit status changes.",
+            f"# TYPE {prefix}_transitions_total counter",
+        ]
+        lines += [f'{prefix}_transitions_total{{from="{_label(old)}",to="{_label(new)}"}} {n}'
+                  for (old, new), n in sorted(self.transitions.items())]
+        if self.last_record is not None and "memory" in self.last_record:
+            memory = self.last_record["memory"]
+            lines += [
+                f"# HELP {prefix}_memory_peak_bytes tracemalloc peak during the last cycle.",
+                f"# TYPE {prefix}_memory_peak_bytes gauge",
+                f"{prefix}_memory_peak_bytes {memory['peak_bytes']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Atomic write, suitable for node_exporter's textfile collector
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+class _PhaseTimer:
+    __slots__ = ("phases", "name", "start")
+
+    def __init__(self, phases, name):
+        self.phases = phases
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.phases[self.name] += time.perf_counter() - self.start
+        return False
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def profile_summary(profiler, top=PROFILE_TOP):
+    # Most expensive functions of a cProfile run, by cumulative time
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({function})",
+            "calls": calls,
+            "tottime": tottime,
+            "cumtime": cumtime,
+        })
+    rows.sort(key=lambda row: row["cumtime"], reverse=True)
+    return rows[:top]
@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+# Candidate zones considered per bot
+DEFAULT_CANDIDATES = 8
+# Added to every cost so zero-distance edges are not read as missing edges
+EPSILON_KM = 1e-6
+
+
+def assign_bots(zone_index, lats, lons, k=DEFAULT_CANDIDATES, exact=False):
+    # Globally optimal bot -> damage zone assignment: each zone gets at most
+    # one bot and the total travel distance is minimal.
+    # The bots x zones cost matrix is sparse, holding only each bot's k
+    # nearest zones (from a DamageZoneIndex), and is solved as a minimum
+    # weight bipartite matching. Every bot also has a private "no target"
+    # option costing more than any set of real moves, so bots that cannot
+    # get one of their k candidates stay unassigned instead of failing.
+    # Costs are haversine distances unless exact=True (geodesic, much slower
+    # for thousands of bots).
+    #
+    # Returns (targets, distances_km, total_km): targets[i] is a position in
+    # zone_index (row of zone_index.zones) or -1, distances_km[i] is NaN for
+    # unassigned bots, and total_km sums the assigned distances.
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    num_bots, num_zones = len(lats), len(zone_index)
+    targets = np.full(num_bots, -1)
+    distances = np.full(num_bots, np.nan)
+    if num_bots == 0 or num_zones == 0:
+        return targets, distances, 0.0
+
+    k = min(k, num_zones)
+    near_km, near = zone_index.query(lats, lons, k=k, exact=exact)
+    unassigned_cost = (near_km.max() + 1.0) * (num_bots + 1)
+
+    rows = np.repeat(np.arange(num_bots), k + 1)
+    cols = np.column_stack([near, num_zones + np.arange(num_bots)]).ravel()
+    costs = np.column_stack([near_km + EPSILON_KM, np.full(num_bots, unassigned_cost)]).ravel()
+    graph = csr_matrix((costs, (rows, cols)), shape=(num_bots, num_zones + num_bots))
+
+    _, matched = min_weight_full_bipartite_matching(graph)
+    real = matched < num_zones
+    targets[real] = matched[real]
+    # Distance of each bot to its matched zone, read back from its candidate row
+    hit = near[real] == matched[real][:, None]
+    distances[real] = near_km[real][hit]
+    return targets, distances, float(np.nansum(distances))
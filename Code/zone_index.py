@@ -0,0 +1,130 @@
+import numpy as np
+from geopy.distance import geodesic
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0088
+# Haversine on the mean-radius sphere is within ~0.6% of the WGS-84 geodesic
+SPHERE_ERROR = 0.01
+# WGS-84 ellipsoid
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B_KM = WGS84_A_KM * (1 - WGS84_F)
+
+
+def vincenty_km(lat1, lon1, lat2, lon2, iterations=200, tolerance=1e-12):
+    # WGS-84 geodesic distance by Vincenty's inverse formula, on whole arrays.
+    # Agrees with geopy's geodesic to well under a millimetre; the few
+    # nearly antipodal pairs it cannot converge on come back as NaN.
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(*(np.radians(np.asarray(v, dtype=float))
+                                                   for v in (lat1, lon1, lat2, lon2)))
+    f = WGS84_F
+    u1 = np.arctan((1 - f) * np.tan(lat1))
+    u2 = np.arctan((1 - f) * np.tan(lat2))
+    sin_u1, cos_u1, sin_u2, cos_u2 = np.sin(u1), np.cos(u1), np.sin(u2), np.cos(u2)
+    big_l = lon2 - lon1
+    lam = big_l.copy()
+    converged = np.zeros(lam.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(iterations):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # Equatorial lines have cos2_alpha == 0
+            cos_2sm = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha)
+            c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_next = big_l + (1 - c) * f * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sm + c * cos_sigma * (-1 + 2 * cos_2sm ** 2)))
+            converged = np.abs(lam_next - lam) < tolerance
+            lam = lam_next
+            if converged.all():
+                break
+        u_sq = cos2_alpha * (WGS84_A_KM ** 2 - WGS84_B_KM ** 2) / WGS84_B_KM ** 2
+        big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = big_b * sin_sigma * (cos_2sm + big_b / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sm ** 2)
+            - big_b / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)))
+        distance = WGS84_B_KM * big_a * (sigma - delta_sigma)
+    return np.where(converged & np.isfinite(distance), distance, np.nan)
+
+
+def geodesic_km(lat1, lon1, lat2, lon2):
+    # Vincenty on arrays, with geopy (Karney) for the pairs it does not converge on
+    distance = vincenty_km(lat1, lon1, lat2, lon2)
+    missing = np.isnan(distance)
+    if missing.any():
+        lat1, lon1, lat2, lon2 = np.broadcast_arrays(lat1, lon1, lat2, lon2)
+        distance[missing] = [
+            geodesic((a, b), (c, d)).km
+            for a, b, c, d in zip(lat1[missing], lon1[missing], lat2[missing], lon2[missing])
+        ]
+    return distance
+
+
+class DamageZoneIndex:
+    # Nearest damage zone lookup.
+    # A haversine BallTree is built once per set of zones and answers k-nearest
+    # queries for all bots in one vectorized call; only the top candidates of
+    # each bot are refined with the exact geodesic distance (vectorized
+    # Vincenty, see geodesic_km).
+
+    def __init__(self, latitudes, longitudes, zones=None):
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.zones = zones
+        self.tree = None
+        if len(self.latitudes):
+            self.tree = BallTree(np.radians(np.column_stack([self.latitudes, self.longitudes])),
+                                 metric="haversine")
+
+    @classmethod
+    def from_frame(cls, df, lat_col="latitude", lon_col="longitude"):
+        zones = df.reset_index(drop=True)
+        return cls(zones[lat_col].to_numpy(), zones[lon_col].to_numpy(), zones=zones)
+
+    def __len__(self):
+        return len(self.latitudes)
+
+    def query(self, lats, lons, k=1, candidates=None, exact=True):
+        # Returns (distances_km, indices), both shaped (len(lats), k), closest first.
+        # Indices are positions in the index (rows of self.zones).
+        # exact=False skips the geodesic refinement and returns haversine
+        # distances (within SPHERE_ERROR), for large batches of queries.
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty((len(lats), 0)), np.empty((len(lats), 0), dtype=int)
+        if not exact:
+            rough, nearest = self.tree.query(np.radians(np.column_stack([lats, lons])), k=k)
+            return rough * EARTH_RADIUS_KM, nearest
+
+        candidates = min(len(self), candidates or max(2 * k, k + 4))
+        points = np.radians(np.column_stack([lats, lons]))
+        distances = np.empty((len(lats), k))
+        indices = np.empty((len(lats), k), dtype=int)
+
+        pending = np.arange(len(lats))
+        while len(pending):
+            rough, nearest = self.tree.query(points[pending], k=candidates)
+            rough *= EARTH_RADIUS_KM
+            geo_km = geodesic_km(lats[pending, None], lons[pending, None],
+                                 self.latitudes[nearest], self.longitudes[nearest])
+            order = np.argsort(geo_km, axis=1)[:, :k]
+            rows = np.arange(len(pending))[:, None]
+            distances[pending] = geo_km[rows, order]
+            indices[pending] = nearest[rows, order]
+
+            # A zone outside the candidate set could still win if the k-th exact
+            # distance is close to the farthest candidate's haversine distance;
+            # retry those bots with a wider candidate set
+            if candidates == len(self):
+                break
+            unsure = distances[pending, -1] > rough[:, -1] * (1 - SPHERE_ERROR)
+            pending = pending[unsure]
+            candidates = min(len(self), candidates * 2)
+
+        return distances, indices
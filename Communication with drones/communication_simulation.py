@@ -2,33 +2,96 @@ import queue
 import threading
 import time
 import random
+import sys
+from collections import Counter, OrderedDict, namedtuple
+
+# Link model shared by the threaded and discrete-event deliveries
+LATENCY_RANGE = (0.05, 0.2)  # seconds
+LOSS_CHANCE = 0.05  # 5% chance to lose message
+
+# Flooding limits for forwarded ALERT messages
+MAX_HOPS = 8  # times a message may be forwarded beyond its first hop
+SEEN_CAPACITY = 1024  # (origin, seq) pairs remembered per node, oldest evicted first
+
+class Envelope(namedtuple("Envelope", ["origin", "seq", "hops_left", "payload"])):
+    __slots__ = ()
+
+    def __str__(self):
+        return self.payload
 
 class CommunicationNode:
-    def __init__(self, node_id):
+    def __init__(self, node_id, network=None, verbose=True, seen_capacity=SEEN_CAPACITY):
         self.node_id = node_id
         self.inbox = queue.Queue()
         self.neighbors = []
         self.running = True
+        self.sequence = 0
+        self.seen = OrderedDict()
+        self.seen_capacity = seen_capacity
+        # sent / delivered / dropped / received / suppressed / forwarded
+        self.stats = Counter()
+        # Guards stats, seen and sequence: in the threaded delivery every
+        # message has its own timer thread next to the listener thread
+        self.lock = threading.Lock()
+        # Optional delivery backend (DiscreteEventNetwork or SocketNetwork);
+        # None uses a thread per message in wall-clock time
+        self.network = network
+        self.verbose = verbose
+        # Backends with per-node endpoints need to know every node up front
+        register = getattr(network, "register", None)
+        if register is not None:
+            register(self)
 
     def add_neighbor(self, neighbor_node):
         self.neighbors.append(neighbor_node)
 
+    def new_envelope(self, payload):
+        with self.lock:
+            self.sequence += 1
+            envelope = Envelope(self.node_id, self.sequence, MAX_HOPS, payload)
+            # Never re-forward our own messages when they come back around
+            self._remember((envelope.origin, envelope.seq))
+        return envelope
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _remember(self, key):
+        # Caller holds self.lock
+        self.seen[key] = True
+        if len(self.seen) > self.seen_capacity:
+            self.seen.popitem(last=False)
+
     def send_message(self, message, target):
+        if not isinstance(message, Envelope):
+            message = self.new_envelope(message)
+        self.count("sent")
+        if self.network is not None:
+            self.network.send(self, target, message)
+            return
+
         # Simulate latency and possible packet loss
-        latency = random.uniform(0.05, 0.2)  # seconds
-        loss_chance = 0.05  # 5% chance to lose message
+        latency = random.uniform(*LATENCY_RANGE)
 
         def delayed_send():
             time.sleep(latency)
-            if random.random() > loss_chance:
+            if random.random() > LOSS_CHANCE:
+                self.count("delivered")
                 target.inbox.put((self.node_id, message))
-                print(f"{self.node_id} → {target.node_id}: {message}")
+                if self.verbose:
+                    print(f"{self.node_id} → {target.node_id}: {message}")
             else:
-                print(f"{self.node_id} → {target.node_id}: Message lost")
+                self.count("dropped")
+                if self.verbose:
+                    print(f"{self.node_id} → {target.node_id}: Message lost")
 
         threading.Thread(target=delayed_send).start()
 
     def broadcast_message(self, message):
+        # One envelope for all neighbors, so they can recognise duplicates
+        if not isinstance(message, Envelope):
+            message = self.new_envelope(message)
         for neighbor in self.neighbors:
             self.send_message(message, neighbor)
 
@@ -36,53 +99,136 @@ class CommunicationNode:
         while self.running:
             try:
                 sender, message = self.inbox.get(timeout=0.5)
-                print(f"{self.node_id} received from {sender}: {message}")
-                # Forward important messages to neighbors except sender
-                if "ALERT" in message:
-                    for neighbor in self.neighbors:
-                        if neighbor.node_id != sender:
-                            self.send_message(message, neighbor)
+                self.handle_message(sender, message)
             except queue.Empty:
                 continue
 
+    def handle_message(self, sender, message):
+        key = (message.origin, message.seq)
+        with self.lock:
+            if key in self.seen:
+                self.seen.move_to_end(key)
+                self.stats["suppressed"] += 1
+                return
+            self._remember(key)
+            self.stats["received"] += 1
+
+        if self.verbose:
+            print(f"{self.node_id} received from {sender}: {message}")
+        # Forward important messages to neighbors except sender, once per node
+        if "ALERT" in message.payload and message.hops_left > 0:
+            forwarded = message._replace(hops_left=message.hops_left - 1)
+            for neighbor in self.neighbors:
+                if neighbor.node_id != sender:
+                    self.count("forwarded")
+                    self.send_message(forwarded, neighbor)
+
     def stop(self):
         self.running = False
 
-# Create nodes representing drones and satellites
-drone1 = CommunicationNode("Drone-1")
-drone2 = CommunicationNode("Drone-2")
-satellite = CommunicationNode("Satellite-1")
-
-# Define communication neighbors (bi-directional)
-drone1.add_neighbor(drone2)
-drone1.add_neighbor(satellite)
-
-drone2.add_neighbor(drone1)
-drone2.add_neighbor(satellite)
-
-satellite.add_neighbor(drone1)
-satellite.add_neighbor(drone2)
-
-# Start listening threads
-threads = []
-for node in [drone1, drone2, satellite]:
-    t = threading.Thread(target=node.listen)
-    t.start()
-    threads.append(t)
-
-# Simulate sending messages
-drone1.send_message("Ozone level normal", drone2)
-drone2.send_message("Ozone level low - ALERT", satellite)
-satellite.broadcast_message("ALERT: Coordinated sprayer deployment needed")
-
-# Let the simulation run briefly
-time.sleep(3)
-
-# Stop all nodes
-for node in [drone1, drone2, satellite]:
-    node.stop()
-
-# Wait for threads to finish
-for t in threads:
-    t.join()
-# End of communication simulation
+def network_stats(nodes):
+    # Message counters summed over all nodes
+    total = Counter()
+    for node in nodes:
+        with node.lock:
+            total.update(node.stats)
+    return dict(total)
+
+def run_threaded_scenario():
+    # Create nodes representing drones and satellites
+    drone1 = CommunicationNode("Drone-1")
+    drone2 = CommunicationNode("Drone-2")
+    satellite = CommunicationNode("Satellite-1")
+
+    # Define communication neighbors (bi-directional)
+    drone1.add_neighbor(drone2)
+    drone1.add_neighbor(satellite)
+
+    drone2.add_neighbor(drone1)
+    drone2.add_neighbor(satellite)
+
+    satellite.add_neighbor(drone1)
+    satellite.add_neighbor(drone2)
+
+    # Start listening threads
+    threads = []
+    for node in [drone1, drone2, satellite]:
+        t = threading.Thread(target=node.listen)
+        t.start()
+        threads.append(t)
+
+    # Simulate sending messages
+    drone1.send_message("Ozone level normal", drone2)
+    drone2.send_message("Ozone level low - ALERT", satellite)
+    satellite.broadcast_message("ALERT: Coordinated sprayer deployment needed")
+
+    # Let the simulation run briefly
+    time.sleep(3)
+
+    # Stop all nodes
+    for node in [drone1, drone2, satellite]:
+        node.stop()
+
+    # Wait for threads to finish
+    for t in threads:
+        t.join()
+
+    print(f"Message counters: {network_stats([drone1, drone2, satellite])}")
+
+def run_discrete_event_scenario(seed=42, duration=3.0):
+    from discrete_event import DiscreteEventNetwork
+
+    network = DiscreteEventNetwork(seed=seed)
+    drone1 = CommunicationNode("Drone-1", network=network)
+    drone2 = CommunicationNode("Drone-2", network=network)
+    satellite = CommunicationNode("Satellite-1", network=network)
+
+    drone1.add_neighbor(drone2)
+    drone1.add_neighbor(satellite)
+    drone2.add_neighbor(drone1)
+    drone2.add_neighbor(satellite)
+    satellite.add_neighbor(drone1)
+    satellite.add_neighbor(drone2)
+
+    drone1.send_message("Ozone level normal", drone2)
+    drone2.send_message("Ozone level low - ALERT", satellite)
+    satellite.broadcast_message("ALERT: Coordinated sprayer deployment needed")
+
+    # Same 3 simulated seconds, without waiting for them
+    network.run(until=duration)
+    print(f"Message counters: {network_stats([drone1, drone2, satellite])}")
+
+def run_socket_scenario(protocol="udp", duration=3.0):
+    from socket_transport import SocketNetwork
+
+    network = SocketNetwork(protocol=protocol)
+    drone1 = CommunicationNode("Drone-1", network=network)
+    drone2 = CommunicationNode("Drone-2", network=network)
+    satellite = CommunicationNode("Satellite-1", network=network)
+
+    drone1.add_neighbor(drone2)
+    drone1.add_neighbor(satellite)
+    drone2.add_neighbor(drone1)
+    drone2.add_neighbor(satellite)
+    satellite.add_neighbor(drone1)
+    satellite.add_neighbor(drone2)
+
+    drone1.send_message("Ozone level normal", drone2)
+    drone2.send_message("Ozone level low - ALERT", satellite)
+    satellite.broadcast_message("ALERT: Coordinated sprayer deployment needed")
+
+    # Same 3 seconds, over real localhost sockets in one event loop
+    network.run(until=duration)
+    print(f"Message counters: {network_stats([drone1, drone2, satellite])}")
+    print(f"Transport counters: {dict(network.stats)}")
+
+if __name__ == "__main__":
+    # Pass --discrete to run on the virtual clock instead of threads, or
+    # --udp / --tcp to send over localhost sockets
+    if "--discrete" in sys.argv:
+        run_discrete_event_scenario()
+    elif "--udp" in sys.argv or "--tcp" in sys.argv:
+        run_socket_scenario("tcp" if "--tcp" in sys.argv else "udp")
+    else:
+        run_threaded_scenario()
+# End of communication simulation
\ No newline at end of file
@@ -0,0 +1,58 @@
+import heapq
+import itertools
+import random
+
+from communication_simulation import LATENCY_RANGE, LOSS_CHANCE
+
+
+class EventScheduler:
+    # Heap-ordered event queue on a virtual clock.
+    # Events at the same time run in the order they were scheduled, so a run
+    # is fully determined by the seed of the random stream.
+
+    def __init__(self, seed=None):
+        self.now = 0.0
+        self.rng = random.Random(seed)
+        self._queue = []
+        self._order = itertools.count()
+
+    def schedule(self, delay, callback, *args):
+        heapq.heappush(self._queue, (self.now + delay, next(self._order), callback, args))
+
+    def pending(self):
+        return len(self._queue)
+
+    def run(self, until=None, max_events=None):
+        # Process events in time order; returns the number of events run
+        processed = 0
+        while self._queue and (max_events is None or processed < max_events):
+            when, _, callback, args = self._queue[0]
+            if until is not None and when > until:
+                break
+            heapq.heappop(self._queue)
+            self.now = when
+            callback(*args)
+            processed += 1
+        if until is not None and (not self._queue or self._queue[0][0] > until):
+            self.now = max(self.now, until)
+        return processed
+
+
+class DiscreteEventNetwork(EventScheduler):
+    # Message delivery for CommunicationNode on the virtual clock, using the
+    # same latency range and loss chance as the threaded delivery
+
+    def send(self, sender, target, message):
+        latency = self.rng.uniform(*LATENCY_RANGE)
+        self.schedule(latency, self._deliver, sender, target, message)
+
+    def _deliver(self, sender, target, message):
+        if self.rng.random() > LOSS_CHANCE:
+            sender.count("delivered")
+            if sender.verbose:
+                print(f"[t={self.now:.3f}s] {sender.node_id} → {target.node_id}: {message}")
+            target.handle_message(sender.node_id, message)
+        else:
+            sender.count("dropped")
+            if sender.verbose:
+                print(f"[t={self.now:.3f}s] {sender.node_id} → {target.node_id}: Message lost")
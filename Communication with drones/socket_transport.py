@@ -0,0 +1,334 @@
+import asyncio
+import json
+import random
+import socket
+import struct
+from collections import Counter, defaultdict, deque
+
+from communication_simulation import LATENCY_RANGE, LOSS_CHANCE
+
+# Frames are a 4-byte big-endian length followed by a UTF-8 JSON body
+FRAME_HEADER = struct.Struct("!I")
+# Largest UDP payload we build; batches bigger than this span several datagrams
+MAX_DATAGRAM = 60000
+# Receive buffer requested for every UDP endpoint (the kernel may cap it)
+UDP_RECEIVE_BUFFER = 4 * 1024 * 1024
+# Links flushed per loop iteration before the loop gets to read again
+DEFAULT_SEND_BURST = 64
+# run() stops once nothing has been sent or received for this long
+DEFAULT_IDLE_TIMEOUT = 0.5  # seconds
+
+
+def encode_frame(sender_id, message):
+    body = json.dumps([sender_id, message.origin, message.seq, message.hops_left, message.payload],
+                      ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def decode_frames(buffer):
+    # (sender_id, envelope fields) for every complete frame in a bytearray;
+    # the complete frames are removed, a trailing partial frame is left behind
+    frames, offset = [], 0
+    while len(buffer) - offset >= FRAME_HEADER.size:
+        (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+        end = offset + FRAME_HEADER.size + length
+        if end > len(buffer):
+            break
+        sender_id, *fields = json.loads(buffer[offset + FRAME_HEADER.size:end].decode("utf-8"))
+        frames.append((sender_id, fields))
+        offset = end
+    del buffer[:offset]
+    return frames
+
+
+class _DatagramEndpoint(asyncio.DatagramProtocol):
+    # One UDP socket per node; a datagram holds one or more whole frames
+
+    def __init__(self, network, node):
+        self.network = network
+        self.node = node
+
+    def datagram_received(self, data, addr):
+        self.network._receive(self.node, decode_frames(bytearray(data)), len(data))
+
+    def error_received(self, exc):
+        # A failed sendto (e.g. an oversize datagram); its frames end up in
+        # stats["lost"] when the run ends
+        self.network.stats["send_errors"] += 1
+
+
+class _StreamEndpoint(asyncio.Protocol):
+    # Server side of a TCP connection into a node; frames may arrive split
+    # across reads, so undecoded bytes are kept until the rest comes in
+
+    def __init__(self, network, node):
+        self.network = network
+        self.node = node
+        self.buffer = bytearray()
+
+    def connection_made(self, transport):
+        # Tracked so the network can close its side when the run ends
+        self.transport = transport
+        self.network._accepted.add(transport)
+
+    def connection_lost(self, exc):
+        self.network._accepted.discard(self.transport)
+
+    def data_received(self, data):
+        self.buffer += data
+        self.network._receive(self.node, decode_frames(self.buffer), len(data))
+
+
+class SocketNetwork:
+    # Message delivery for CommunicationNode over real localhost sockets.
+    # Every node gets its own asyncio endpoint (a UDP socket, or a TCP server
+    # with one pooled connection into it), all served by a single event
+    # loop, so thousands of nodes fit in one process. Messages are encoded
+    # as length-prefixed JSON frames; frames queued to the same link go out
+    # in one write, as soon as batch_size of them are waiting or when the
+    # link's turn comes. Only send_burst links are flushed per loop
+    # iteration, so receivers get to drain their sockets between bursts
+    # instead of a flood overrunning the UDP receive buffers.
+    # Latency and loss are injected on the sending side with the same link
+    # model as the other backends; latency=(0, 0), loss=0 measures the bare
+    # transport. Nodes register themselves when created with network=...,
+    # sends made before run() are queued until the endpoints are open.
+    # UDP can also lose frames for real (full socket buffers under a flood);
+    # those, and anything still in flight when a timed run stops, are
+    # counted as stats["lost"] when the run ends. Every run starts clean, so
+    # the same network can run() again; nodes must be created before it does.
+
+    def __init__(self, protocol="udp", host="127.0.0.1", latency=LATENCY_RANGE, loss=LOSS_CHANCE,
+                 batch_size=64, send_burst=DEFAULT_SEND_BURST, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 seed=None):
+        if protocol not in ("udp", "tcp"):
+            raise ValueError(f"protocol must be 'udp' or 'tcp', not {protocol!r}")
+        self.protocol = protocol
+        self.host = host
+        self.latency = latency
+        self.loss = loss
+        self.batch_size = batch_size
+        self.send_burst = send_burst
+        self.idle_timeout = idle_timeout
+        self.rng = random.Random(seed)
+        self.nodes = {}
+        self.addresses = {}
+        # frames / bytes_sent / bytes_received / writes / connections / lost.
+        # writes counts sendto()/write() calls on the transports, not syscalls:
+        # asyncio buffers and coalesces writes it cannot send right away
+        self.stats = Counter()
+        self.in_flight = 0
+        self._loop = None
+        self._pending = []
+        self._batches = defaultdict(list)
+        self._ready = deque()  # links with queued frames, oldest first
+        self._flush_scheduled = False
+        self._endpoints = {}
+        self._connections = {}
+        self._accepted = set()  # server side of TCP connections
+        # Bumped at the end of every run, so delayed frames of an earlier run
+        # never reach the next one
+        self._run_id = 0
+        self._last_activity = 0.0
+        # Frames are decoded into the Envelope class the senders used, which is
+        # __main__.Envelope when communication_simulation runs as a script
+        self._envelope = None
+
+    def register(self, node):
+        if node.node_id in self.nodes:
+            return
+        if self._loop is not None:
+            # Endpoints are opened when the run starts; a node added later
+            # would have no socket or address
+            raise RuntimeError(f"Cannot add node {node.node_id!r} while the network is running; "
+                               "create every node before run()")
+        self.nodes[node.node_id] = node
+
+    def send(self, sender, target, message):
+        self.register(sender)
+        self.register(target)
+        if self._loop is None:
+            self._pending.append((sender, target, message))
+            return
+        if self.rng.random() < self.loss:
+            sender.count("dropped")
+            if sender.verbose:
+                print(f"[{self.protocol}] {sender.node_id} → {target.node_id}: Message lost")
+            return
+        self._envelope = type(message)
+        self.in_flight += 1
+        self._last_activity = self._loop.time()
+        frame = encode_frame(sender.node_id, message)
+        latency = self.rng.uniform(*self.latency)
+        if latency > 0:
+            self._loop.call_later(latency, self._queue_delayed, self._run_id,
+                                  sender.node_id, target.node_id, frame)
+        else:
+            self._queue(sender.node_id, target.node_id, frame)
+
+    def _queue_delayed(self, run_id, sender_id, target_id, frame):
+        # Already counted as lost if its run has ended
+        if run_id == self._run_id:
+            self._queue(sender_id, target_id, frame)
+
+    def _queue(self, sender_id, target_id, frame):
+        batch = self._batches[sender_id, target_id]
+        if not batch:
+            self._ready.append((sender_id, target_id))
+        batch.append(frame)
+        if len(batch) >= self.batch_size:
+            self._flush_link(sender_id, target_id)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._ready and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+
+    def _flush(self):
+        # One burst of links, then back to the loop (which polls the sockets)
+        self._flush_scheduled = False
+        for _ in range(min(self.send_burst, len(self._ready))):
+            self._flush_link(*self._ready.popleft())
+        self._schedule_flush()
+
+    def _flush_link(self, sender_id, target_id):
+        frames = self._batches.pop((sender_id, target_id), None)
+        if not frames:
+            return
+        self.stats["frames"] += len(frames)
+        self._last_activity = self._loop.time()
+        if self.protocol == "udp":
+            transport = self._endpoints[sender_id]
+            address = self.addresses[target_id]
+            datagram, size = [], 0
+            for frame in frames:
+                if datagram and size + len(frame) > MAX_DATAGRAM:
+                    self._sendto(transport, datagram, address)
+                    datagram, size = [], 0
+                datagram.append(frame)
+                size += len(frame)
+            self._sendto(transport, datagram, address)
+        else:
+            self._write(target_id, frames)
+
+    def _sendto(self, transport, frames, address):
+        data = b"".join(frames)
+        transport.sendto(data, address)
+        self.stats["writes"] += 1
+        self.stats["bytes_sent"] += len(data)
+
+    def _write(self, target_id, frames):
+        # TCP links are pooled per target: all senders in this process share
+        # one connection into each node, the frames carry the sender id
+        connection = self._connections.get(target_id)
+        if isinstance(connection, asyncio.Transport):
+            data = b"".join(frames)
+            connection.write(data)
+            self.stats["writes"] += 1
+            self.stats["bytes_sent"] += len(data)
+        elif connection is None:
+            self._connections[target_id] = list(frames)
+            self._loop.create_task(self._connect(target_id))
+        else:
+            connection.extend(frames)  # still connecting
+
+    async def _connect(self, target_id):
+        host, port = self.addresses[target_id]
+        run_id = self._run_id
+        try:
+            transport, _ = await self._loop.create_connection(asyncio.Protocol, host, port)
+        except OSError:
+            if run_id != self._run_id:
+                return  # the run ended meanwhile and counted these frames
+            # The frames waiting for this link are gone; the next send retries
+            waiting = self._connections.pop(target_id)
+            self.stats["connect_errors"] += 1
+            self.stats["lost"] += len(waiting)
+            self.in_flight -= len(waiting)
+            return
+        if run_id != self._run_id:
+            transport.close()
+            return
+        self.stats["connections"] += 1
+        waiting = self._connections[target_id]
+        self._connections[target_id] = transport
+        self._write(target_id, waiting)
+
+    def _receive(self, node, frames, size):
+        self.stats["bytes_received"] += size
+        self._last_activity = self._loop.time()
+        for sender_id, fields in frames:
+            message = self._envelope(*fields)
+            self.in_flight -= 1
+            sender = self.nodes.get(sender_id)
+            if sender is not None:
+                sender.count("delivered")
+                if sender.verbose:
+                    print(f"[{self.protocol}] {sender_id} → {node.node_id}: {message}")
+            node.handle_message(sender_id, message)
+
+    async def _open(self):
+        for node_id, node in self.nodes.items():
+            if self.protocol == "udp":
+                transport, _ = await self._loop.create_datagram_endpoint(
+                    lambda node=node: _DatagramEndpoint(self, node), local_addr=(self.host, 0))
+                transport.get_extra_info("socket").setsockopt(
+                    socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECEIVE_BUFFER)
+                self._endpoints[node_id] = transport
+                self.addresses[node_id] = transport.get_extra_info("sockname")[:2]
+            else:
+                server = await self._loop.create_server(
+                    lambda node=node: _StreamEndpoint(self, node), self.host, 0)
+                self._endpoints[node_id] = server
+                self.addresses[node_id] = server.sockets[0].getsockname()[:2]
+
+    def _close(self):
+        for connection in self._connections.values():
+            if isinstance(connection, asyncio.Transport):
+                connection.close()
+        for transport in list(self._accepted):
+            transport.close()
+        for endpoint in self._endpoints.values():
+            endpoint.close()
+        self._connections.clear()
+        self._accepted.clear()
+        self._endpoints.clear()
+        self.addresses.clear()
+        # Frames still queued or waiting on a timer are counted as lost
+        self._batches.clear()
+        self._ready.clear()
+        self._flush_scheduled = False
+        self._run_id += 1
+        self.stats["lost"] += max(self.in_flight, 0)
+        self.in_flight = 0
+
+    async def serve(self, until=None):
+        # Run inside an existing event loop: open every registered node's
+        # endpoint, send the queued messages and deliver traffic for `until`
+        # seconds, or, with until=None, until nothing is in flight (or the
+        # network has been idle for idle_timeout, e.g. after a real drop).
+        # Frames not delivered by then count as lost.
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self._open()
+            start = self._last_activity = self._loop.time()
+            pending, self._pending = self._pending, []
+            for sender, target, message in pending:
+                self.send(sender, target, message)
+            while True:
+                await asyncio.sleep(0.01)
+                now = self._loop.time()
+                if until is not None:
+                    if now - start >= until:
+                        break
+                elif self.in_flight <= 0 or now - self._last_activity >= self.idle_timeout + max(self.latency):
+                    break
+            return self._loop.time() - start
+        finally:
+            self._close()
+            self._loop = None
+
+    def run(self, until=None):
+        # Blocking wrapper around serve(); returns the wall-clock seconds run
+        return asyncio.run(self.serve(until))
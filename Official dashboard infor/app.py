@@ -1,11 +1,24 @@
 import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output
-import plotly.express as px
+from dash import Patch, dcc, html, no_update
+from dash.dependencies import Input, Output, State
 import pandas as pd
+import math
 import random
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+from telemetry_ring import TelemetryRing
+from telemetry_store import TelemetryStore, start_producer
+
+UPDATE_SECONDS = 5
+OVERRIDE_COLORS = {"None": "#636efa", "Altitude Drop": "#EF553B", "Ozone Spike": "#00cc96"}
+# Trace holding the units; the traces before it only draw the legend
+UNITS_TRACE = len(OVERRIDE_COLORS)
+# Marker area per ppm, fixed so size updates never touch the layout
+SIZE_REF = 2.0 * 4.0 / (20 ** 2)
+
 # --- MODEL FUNCTION ---
 def model_ozone_level(altitude, lat):
     base = 2.0
@@ -14,14 +27,30 @@ def model_ozone_level(altitude, lat):
     return round(base + ozone_variation + noise, 2)
 
 # --- SWARM DATA ---
+UNITS = ["OTS-001", "OTS-002", "OTS-003", "OTS-004", "OTS-005"]
+# Each unit keeps its position between ticks and drifts a little per tick
+_unit_state = {}
+
+def move_unit(unit):
+    state = _unit_state.get(unit)
+    if state is None:
+        state = _unit_state[unit] = {
+            "altitude": random.randint(8000, 15000),
+            "lat": math.degrees(math.asin(random.uniform(-1, 1))),
+            "lon": random.uniform(-180, 180),
+        }
+    else:
+        state["altitude"] = min(15000, max(8000, state["altitude"] + random.randint(-500, 500)))
+        state["lat"] = min(89.9, max(-89.9, state["lat"] + random.uniform(-2, 2)))
+        state["lon"] = (state["lon"] + random.uniform(-2, 2) + 180) % 360 - 180
+    return state
+
 def generate_swarm_data():
-    units = ["OTS-001", "OTS-002", "OTS-003", "OTS-004", "OTS-005"]
     data = []
 
-    for unit in units:
-        altitude = random.randint(8000, 15000)
-        lat = random.uniform(-90, 90)
-        lon = random.uniform(-180, 180)
+    for unit in UNITS:
+        state = move_unit(unit)
+        altitude, lat, lon = state["altitude"], state["lat"], state["lon"]
         ozone = model_ozone_level(altitude, lat)
         override = "None"
         
@@ -49,11 +78,157 @@ def generate_swarm_data():
 
     return pd.DataFrame(data)
 
+# --- FIGURE ---
+def build_figure():
+    # Built once; callbacks only patch the units trace and never resend the layout.
+    # A plain figure dict: no plotly objects are built or validated at startup
+    data = [
+        {"type": "scattergeo", "lat": [None], "lon": [None], "mode": "markers", "name": override,
+         "marker": {"color": color, "size": 10}, "hoverinfo": "skip"}
+        for override, color in OVERRIDE_COLORS.items()
+    ]
+    data.append({
+        "type": "scattergeo", "lat": [], "lon": [], "mode": "markers", "showlegend": False,
+        "marker": {"size": [], "color": [], "sizemode": "area", "sizeref": SIZE_REF, "sizemin": 4},
+        "customdata": [], "hovertext": [],
+        "hovertemplate": (
+            "<b>%{hovertext}</b><br>Altitude (m)=%{customdata[0]}<br>"
+            "Ozone Level (ppm)=%{customdata[1]}<br>Payload Deployed=%{customdata[2]}<br>"
+            "Mission Confidence=%{customdata[3]}<br>User Override=%{customdata[4]}<br>"
+            "Safety Alert=%{customdata[5]}<br>Timestamp=%{customdata[6]}<extra></extra>"
+        )
+    })
+
+    layout = dict(
+        height=650,
+        geo=dict(
+            projection=dict(type="orthographic"),
+            landcolor="rgb(30,30,30)",
+            showocean=True,
+            oceancolor="rgb(10,25,60)",
+            lakecolor="rgb(10,25,60)",
+            showcountries=True,
+            bgcolor="#0b0c10"
+        ),
+        legend=dict(title=dict(text="User Override")),
+        paper_bgcolor="#0b0c10",
+        plot_bgcolor="#0b0c10",
+        font=dict(color="white"),
+        margin={"r":0, "t":0, "l":0, "b":0},
+        dragmode="zoom",
+        uirevision="swarm"
+    )
+    return {"data": data, "layout": layout}
+
+def unit_columns(df):
+    # Per-unit values of the units trace, keyed by their path in the trace
+    return {
+        ("lat",): df["Latitude"].tolist(),
+        ("lon",): df["Longitude"].tolist(),
+        ("marker", "size"): df["Ozone Level (ppm)"].tolist(),
+        ("marker", "color"): [OVERRIDE_COLORS[o] for o in df["User Override"]],
+        ("hovertext",): df["Unit ID"].tolist(),
+        ("customdata",): df[["Altitude (m)", "Ozone Level (ppm)", "Payload Deployed",
+                             "Mission Confidence", "User Override", "Safety Alert",
+                             "Timestamp"]].values.tolist(),
+    }
+
+# --- SNAPSHOTS ---
+# Swarm snapshots read once per tick from the shared store and reused by every
+# connected client, plus the delta from the previous tick
+_snapshots = OrderedDict()
+_deltas = {}
+_snapshot_lock = threading.Lock()
+# Recent per-unit history of the ticks this process has read, newest last
+telemetry = TelemetryRing(capacity=10_000, max_units=len(UNITS))
+
+def current_tick():
+    return int(time.time() // UPDATE_SECONDS)
+
+# Every worker reads the same ticks from the shared store; only the process
+# holding the producer lock generates them. Both are set up by the server on
+# its first request, so importing this module has no side effects.
+_store = None
+_producer = None
+_startup_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _startup_lock:
+        if _store is None:
+            _store = TelemetryStore()
+        return _store
+
+def ensure_producer():
+    global _producer
+    store = get_store()
+    with _startup_lock:
+        if _producer is None:
+            _producer = start_producer(store, generate_swarm_data, UPDATE_SECONDS, current_tick)
+        return _producer
+
+def swarm_snapshot(tick):
+    with _snapshot_lock:
+        if tick not in _snapshots:
+            df = get_store().read(tick)
+            _snapshots[tick] = (df, unit_columns(df))
+            # The ring wants ticks in order; older ticks read for deltas are skipped
+            if telemetry.last_cycle() is None or tick > telemetry.last_cycle():
+                telemetry.ingest_columns({**{name: df[name].to_numpy() for name in df.columns},
+                                          "Cycle": [tick] * len(df)})
+            while len(_snapshots) > 2:
+                _snapshots.popitem(last=False)
+        return _snapshots[tick]
+
+def swarm_delta(tick):
+    # {path: [(unit index, value), ...]} for values that changed since tick - 1,
+    # or None when the previous snapshot is unknown or the unit list changed
+    with _snapshot_lock:
+        if tick in _deltas:
+            return _deltas[tick]
+        if tick - 1 not in _snapshots or tick not in _snapshots:
+            return None
+        old, new = _snapshots[tick - 1][1], _snapshots[tick][1]
+        if old[("hovertext",)] != new[("hovertext",)]:
+            delta = None
+        else:
+            delta = {
+                path: [(i, v) for i, (u, v) in enumerate(zip(old[path], new[path])) if u != v]
+                for path in new
+            }
+        _deltas.clear()
+        _deltas[tick] = delta
+        return delta
+
+def figure_patch(tick, client_tick):
+    # Patch for the units trace: only changed values when the client holds the
+    # previous tick, whole columns otherwise
+    _, columns = swarm_snapshot(tick)
+    patch = Patch()
+    delta = swarm_delta(tick) if client_tick == tick - 1 else None
+    for path, values in columns.items():
+        parent = patch["data"][UNITS_TRACE]
+        for key in path[:-1]:
+            parent = parent[key]
+        if delta is None or 2 * len(delta[path]) > len(values):
+            # Resending the column is smaller than indexing most of it
+            parent[path[-1]] = values
+        else:
+            for i, value in delta[path]:
+                parent[path[-1]][i] = value
+    return patch
+
 # --- DASH SETUP ---
 app = dash.Dash(__name__)
 app.title = "OTS Swarm | Space Interface"
 server = app.server
 
+# Runs in every server process (app.run or a gunicorn worker); start_producer
+# makes sure only one of them actually produces
+@server.before_request
+def start_telemetry():
+    ensure_producer()
+
 # --- LAYOUT ---
 app.layout = html.Div([
     html.Div([
@@ -62,10 +237,12 @@ app.layout = html.Div([
     ], className="header"),
 
     html.Div([
-        dcc.Graph(id="map-graph", className="big-graph")
+        dcc.Graph(id="map-graph", figure=build_figure(), className="big-graph")
     ], className="graph-container"),
 
-    dcc.Interval(id="interval-component", interval=5000, n_intervals=0),
+    dcc.Interval(id="interval-component", interval=UPDATE_SECONDS * 1000, n_intervals=0),
+    # Update tick whose units this client has drawn
+    dcc.Store(id="map-tick"),
 
     html.Div([
         html.Div(id="last-update", className="status-box"),
@@ -79,53 +256,26 @@ app.layout = html.Div([
 # --- CALLBACK ---
 @app.callback(
     Output("map-graph", "figure"),
+    Output("map-tick", "data"),
     Output("last-update", "children"),
     Output("feedback-log", "children"),
     Output("emergency-status", "children"),
-    Input("interval-component", "n_intervals")
+    Input("interval-component", "n_intervals"),
+    State("map-tick", "data")
 )
-def update_dashboard(n):
-    df = generate_swarm_data()
-
-    fig = px.scatter_geo(
-        df,
-        lat="Latitude",
-        lon="Longitude",
-        color="User Override",
-        size="Ozone Level (ppm)",
-        hover_name="Unit ID",
-        hover_data={
-            "Altitude (m)": True,
-            "Ozone Level (ppm)": True,
-            "Payload Deployed": True,
-            "Mission Confidence": True,
-            "User Override": True,
-            "Safety Alert": True,
-            "Timestamp": True,
-            "Latitude": False,
-            "Longitude": False
-        },
-        projection="orthographic"
-    )
-
-    fig.update_layout(
-        height=650,
-        geo=dict(
-            landcolor="rgb(30,30,30)",
-            showocean=True,
-            oceancolor="rgb(10,25,60)",
-            lakecolor="rgb(10,25,60)",
-            showcountries=True,
-            bgcolor="#0b0c10"
-        ),
-        paper_bgcolor="#0b0c10",
-        plot_bgcolor="#0b0c10",
-        font=dict(color="white"),
-        margin={"r":0, "t":0, "l":0, "b":0},
-        dragmode="zoom"
-    )
+def update_dashboard(n, client_tick):
+    tick = get_store().latest_tick()
+    if tick is None:
+        # Producer has not published its first snapshot yet
+        return no_update, no_update, no_update, no_update, no_update
+    df, _ = swarm_snapshot(tick)
+    # Patch only the units trace; skip the figure if this client is up to date
+    figure = no_update if client_tick == tick else figure_patch(tick, client_tick)
 
-    last_update = f"🕒 Cycle {n} | Units Active: {len(df)} | UTC: {datetime.utcnow().strftime('%H:%M:%S')}"
+    newest = telemetry.latest_all()["timestamp"]
+    age = f"{time.time() - newest.max():.0f}s" if len(newest) else "n/a"
+    last_update = (f"🕒 Cycle {n} | Units Active: {len(df)} | Data age: {age} | "
+                   f"UTC: {datetime.utcnow().strftime('%H:%M:%S')}")
     feedback_summary = df["User Override"].value_counts().to_dict()
     feedback_text = "🔁 Override Summary: " + ", ".join(f"{k}: {v}" for k, v in feedback_summary.items())
 
@@ -139,7 +289,7 @@ def update_dashboard(n):
         if avg_conf < 0.7:
             emergency_text += f"Avg Confidence: {avg_conf:.2f}"
 
-    return fig, last_update, feedback_text, emergency_text
+    return figure, tick, last_update, feedback_text, emergency_text
 
 # --- RUN ---
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Typed columns kept for every report
+FIELDS = {
+    "cycle": np.int32,
+    "unit": np.int32,
+    "altitude": np.float32,
+    "latitude": np.float32,
+    "longitude": np.float32,
+    "ozone": np.float32,
+    "co2": np.float32,
+    "nox": np.float32,
+    "payload": bool,
+    "compound": bool,
+    "timestamp": np.float64,
+}
+# OzoneSwarmUnit.report / OzoneSwarmEngine.report_columns keys for each field
+REPORT_KEYS = {
+    "cycle": "Cycle",
+    "altitude": "Altitude (m)",
+    "latitude": "Latitude",
+    "longitude": "Longitude",
+    "ozone": "Ozone Level (ppm)",
+    "co2": "CO₂ (ppm)",
+    "nox": "NOx (ppm)",
+    "payload": "Payload Deployed",
+    "compound": "Compound Deployed",
+    "timestamp": "Timestamp",
+}
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _missing(dtype):
+    return np.nan if np.dtype(dtype).kind == "f" else 0
+
+
+def _epoch(timestamp):
+    if timestamp is None or timestamp == "":
+        return np.nan
+    if isinstance(timestamp, str):
+        # Producers (SimulationClock, app.py) write naive UTC times
+        return datetime.strptime(timestamp, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+    return float(timestamp)
+
+
+class TelemetryRing:
+    # Fixed-capacity telemetry history for live swarm data.
+    # Reports go into preallocated typed column arrays that overwrite the
+    # oldest rows, so memory is constant however long the swarm runs.
+    # Latest-per-unit lookups are O(1); cycle windows are a binary search,
+    # assuming reports arrive in non-decreasing cycle order.
+
+    def __init__(self, capacity=100_000, max_units=10_000):
+        self.capacity = capacity
+        self.max_units = max_units
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in FIELDS.items()}
+        self.count = 0  # rows ever written; row i lives at slot i % capacity
+        self.unit_ids = []
+        self._unit_index = {}
+        self._latest = np.full(max_units, -1, dtype=np.int64)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def _unit(self, unit_id):
+        idx = self._unit_index.get(unit_id)
+        if idx is None:
+            if len(self.unit_ids) >= self.max_units:
+                raise ValueError(f"TelemetryRing is limited to {self.max_units} units")
+            idx = self._unit_index[unit_id] = len(self.unit_ids)
+            self.unit_ids.append(unit_id)
+        return idx
+
+    def ingest(self, record, cycle=None):
+        # Accepts an OzoneSwarmUnit.report() dict, or a SwarmUnit after its
+        # cycle (pass the cycle number, SwarmUnit does not track it)
+        if isinstance(record, dict):
+            values = {name: record.get(key) for name, key in REPORT_KEYS.items()}
+            unit_id = record["Unit ID"]
+            if cycle is not None:
+                values["cycle"] = cycle
+        else:
+            values = {
+                "cycle": cycle,
+                "altitude": getattr(record, "altitude", None),
+                "latitude": getattr(record, "lat", None),
+                "longitude": getattr(record, "lon", None),
+                "ozone": record.ozone_level,
+                "co2": record.co2_level,
+                "nox": record.nox_level,
+                "payload": record.payload_deployed,
+                "compound": getattr(record, "compound_deployed", False),
+                "timestamp": None,
+            }
+            unit_id = record.unit_id
+        if values["cycle"] is None:
+            raise ValueError("A cycle number is required for this record")
+
+        slot = self.count % self.capacity
+        columns = self.columns
+        columns["unit"][slot] = unit = self._unit(unit_id)
+        columns["timestamp"][slot] = _epoch(values.pop("timestamp"))
+        for name, value in values.items():
+            columns[name][slot] = _missing(FIELDS[name]) if value is None else value
+        self._latest[unit] = self.count
+        self.count += 1
+
+    def ingest_columns(self, report_columns):
+        # Bulk ingest, e.g. OzoneSwarmEngine.report_columns(...)
+        units = np.array([self._unit(u) for u in report_columns["Unit ID"]], dtype=np.int32)
+        n = len(units)
+        if n > self.capacity:
+            raise ValueError("Batch is larger than the ring capacity")
+        slots = (self.count + np.arange(n)) % self.capacity
+        self.columns["unit"][slots] = units
+        for name, key in REPORT_KEYS.items():
+            values = report_columns.get(key)
+            if name == "timestamp":
+                values = [_epoch(v) for v in values] if values is not None else np.nan
+            self.columns[name][slots] = _missing(FIELDS[name]) if values is None else values
+        self._latest[units] = self.count + np.arange(n)
+        self.count += n
+
+    def last_cycle(self):
+        # Cycle of the newest report, or None while the ring is empty
+        if not self.count:
+            return None
+        return int(self.columns["cycle"][(self.count - 1) % self.capacity])
+
+    def _oldest(self):
+        return max(0, self.count - self.capacity)
+
+    def _rows(self, seqs):
+        seqs = np.asarray(seqs, dtype=np.int64)
+        slots = seqs % self.capacity
+        rows = {name: column[slots] for name, column in self.columns.items()}
+        rows["unit_id"] = np.array(self.unit_ids, dtype=object)[rows["unit"]]
+        return rows
+
+    def latest(self, unit_id):
+        # Most recent report of one unit as a dict, or None if it was overwritten
+        idx = self._unit_index.get(unit_id)
+        if idx is None or self._latest[idx] < self._oldest():
+            return None
+        slot = self._latest[idx] % self.capacity
+        row = {name: column[slot].item() for name, column in self.columns.items()}
+        row["unit_id"] = unit_id
+        return row
+
+    def latest_all(self):
+        # Most recent report of every unit still in the buffer, as columns
+        seqs = self._latest[:len(self.unit_ids)]
+        return self._rows(seqs[seqs >= self._oldest()])
+
+    def window(self, first_cycle, last_cycle):
+        # All reports with first_cycle <= cycle <= last_cycle, oldest first
+        oldest = self._oldest()
+        cycles = self.columns["cycle"]
+        key = lambda seq: cycles[seq % self.capacity]
+        seqs = range(oldest, self.count)
+        lo = bisect_left(seqs, first_cycle, key=key)
+        hi = bisect_right(seqs, last_cycle, key=key)
+        return self._rows(np.arange(oldest + lo, oldest + hi))
+
+    def last(self, n):
+        # The n most recent reports, oldest first
+        return self._rows(np.arange(max(self._oldest(), self.count - n), self.count))
@@ -0,0 +1,112 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: no gunicorn there, the single process produces
+    fcntl = None
+
+DEFAULT_PATH = os.environ.get(
+    "OTS_TELEMETRY_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "swarm_telemetry.db")
+)
+# Ticks kept in the store; readers only ever need the latest two
+KEEP_TICKS = 10
+
+log = logging.getLogger(__name__)
+
+COLUMNS = {
+    "Unit ID": "unit_id TEXT",
+    "Altitude (m)": "altitude INTEGER",
+    "Latitude": "latitude REAL",
+    "Longitude": "longitude REAL",
+    "Ozone Level (ppm)": "ozone REAL",
+    "Payload Deployed": "payload INTEGER",
+    "Mission Confidence": "confidence REAL",
+    "User Override": "override TEXT",
+    "Timestamp": "timestamp TEXT",
+    "Safety Alert": "alert TEXT",
+}
+_SQL_NAMES = [definition.split()[0] for definition in COLUMNS.values()]
+
+
+class TelemetryStore:
+    # Swarm state shared by every worker process through SQLite in WAL mode.
+    # One producer publishes a snapshot per tick; readers never block it and
+    # always see a complete tick, because each tick is one transaction.
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS swarm_state ("
+                "tick INTEGER, unit_index INTEGER, "
+                + ", ".join(COLUMNS.values())
+                + ", PRIMARY KEY (tick, unit_index))"
+            )
+
+    def _connection(self):
+        # sqlite3 connections are per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def publish(self, tick, df):
+        rows = [
+            (tick, i, *row)
+            for i, row in enumerate(df[list(COLUMNS)].itertuples(index=False, name=None))
+        ]
+        placeholders = ", ".join("?" * (len(COLUMNS) + 2))
+        with self._connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO swarm_state VALUES ({placeholders})", rows
+            )
+            conn.execute("DELETE FROM swarm_state WHERE tick <= ?", (tick - KEEP_TICKS,))
+
+    def latest_tick(self):
+        return self._connection().execute("SELECT MAX(tick) FROM swarm_state").fetchone()[0]
+
+    def read(self, tick):
+        rows = self._connection().execute(
+            f"SELECT {', '.join(_SQL_NAMES)} FROM swarm_state WHERE tick = ? ORDER BY unit_index",
+            (tick,)
+        ).fetchall()
+        df = pd.DataFrame(rows, columns=list(COLUMNS))
+        df["Payload Deployed"] = df["Payload Deployed"].astype(bool)
+        return df
+
+
+def start_producer(store, generate, interval, tick_fn):
+    # Start a background thread that publishes generate() every interval
+    # seconds, but only in the one process holding the producer lock. Other
+    # processes wait on the lock and take over if the producer exits.
+    # A failing tick is logged and skipped, so one bad snapshot (or a locked
+    # database) does not stop telemetry for good.
+    def produce():
+        while True:
+            tick = tick_fn()
+            try:
+                store.publish(tick, generate())
+            except Exception:
+                log.exception("Telemetry producer failed to publish tick %s", tick)
+            time.sleep(max(0.0, (tick + 1) * interval - time.time()))
+
+    def run():
+        if fcntl is not None:
+            lock_file = open(store.path + ".producer.lock", "w")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        produce()
+
+    thread = threading.Thread(target=run, name="telemetry-producer", daemon=True)
+    thread.start()
+    return thread
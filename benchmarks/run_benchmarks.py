@@ -0,0 +1,357 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+# The project's scripts import each other by folder, not as packages
+for folder in ("Code", "Ai Swarm Simulation", "Communication with drones", "Official dashboard infor"):
+    sys.path.insert(0, os.path.join(ROOT, folder))
+
+# name -> (setup(param) -> (run, items per run), params)
+BENCHMARKS = {}
+
+
+def benchmark(name, params=(None,)):
+    def register(setup):
+        BENCHMARKS[name] = (setup, params)
+        return setup
+    return register
+
+
+# --- swarm steps ---
+
+@benchmark("swarm.ozone_unit_step", params=(10, 100, 1000))
+def bench_ozone_unit_step(num_units):
+    from ots_swarm_simulation import OzoneSwarmUnit
+    random.seed(0)
+    units = [OzoneSwarmUnit(f"OTS-{i+1:03}") for i in range(num_units)]
+
+    def run():
+        for unit in units:
+            unit.analyze_and_act()
+    return run, num_units
+
+
+@benchmark("swarm.ozone_engine_step", params=(10, 100, 1000, 10000))
+def bench_ozone_engine_step(num_units):
+    from ots_swarm_engine import OzoneSwarmEngine
+    engine = OzoneSwarmEngine(num_units, seed=0)
+    return engine.analyze_and_act, num_units
+
+
+@benchmark("swarm.swarm_unit_step", params=(10, 100, 1000))
+def bench_swarm_unit_step(num_units):
+    from swarm_simulation import SwarmSimulation
+    simulation = SwarmSimulation(num_units, rng=random.Random(0), verbose=False)
+    return simulation.step, num_units
+
+
+# --- ozone dashboard data preparation ---
+
+def _dataset(size):
+    from ozone_data import OzoneDataset, simulate_ozone_data
+    return OzoneDataset(simulate_ozone_data(seed=42, size=size), f"bench-n{size}")
+
+
+@benchmark("dashboard.dataset_build", params=(1000, 100_000))
+def bench_dataset_build(size):
+    from ozone_data import OzoneDataset, simulate_ozone_data
+    df = simulate_ozone_data(seed=42, size=size)
+    return (lambda: OzoneDataset(df, "bench")), size
+
+
+@benchmark("dashboard.year_filter", params=(1000, 100_000))
+def bench_year_filter(size):
+    dataset = _dataset(size)
+
+    def run():
+        for year in dataset.years:
+            dataset.for_year(year)
+    return run, len(dataset.years)
+
+
+@benchmark("dashboard.year_groupby", params=(1000, 100_000))
+def bench_year_groupby(size):
+    df = _dataset(size).df
+    return (lambda: df.groupby('year')['ozone_du'].mean().reset_index()), size
+
+
+@benchmark("dashboard.trend_fit", params=(1000, 100_000))
+def bench_trend_fit(size):
+    from ozone_trends import IncrementalTrend
+    df = _dataset(size).df
+
+    def run():
+        trends = IncrementalTrend(cell_deg=30)
+        trends.update_many(df['year'], df['latitude'], df['longitude'], df['ozone_du'])
+        trends.global_predict(range(2025, 2031))
+        trends.cell_predict(2030)
+    return run, size
+
+
+# --- nearest damage zone matching ---
+
+def _zones(num_zones, seed=1):
+    rng = random.Random(seed)
+    lats = [rng.uniform(-90, 90) for _ in range(num_zones)]
+    lons = [rng.uniform(-180, 180) for _ in range(num_zones)]
+    return lats, lons
+
+
+@benchmark("zones.index_build", params=(100, 1000, 10000))
+def bench_zone_index_build(num_zones):
+    from zone_index import DamageZoneIndex
+    lats, lons = _zones(num_zones)
+    return (lambda: DamageZoneIndex(lats, lons)), num_zones
+
+
+@benchmark("zones.nearest_query", params=(100, 1000, 10000))
+def bench_zone_nearest(num_zones):
+    # 100 bots against a growing number of zones, as in the dashboard's section 6
+    from zone_index import DamageZoneIndex
+    index = DamageZoneIndex(*_zones(num_zones))
+    bot_lats, bot_lons = _zones(100, seed=2)
+    return (lambda: index.query(bot_lats, bot_lons, k=1)), len(bot_lats)
+
+
+# --- drone communication ---
+
+@benchmark("comms.alert_flood", params=(5, 20, 50))
+def bench_alert_flood(num_nodes):
+    # Every node broadcasts one ALERT on a fully connected mesh, run to
+    # completion on the discrete-event clock
+    from communication_simulation import CommunicationNode, network_stats
+    from discrete_event import DiscreteEventNetwork
+
+    def flood():
+        network = DiscreteEventNetwork(seed=0)
+        nodes = [CommunicationNode(f"Node-{i}", network=network, verbose=False)
+                 for i in range(num_nodes)]
+        for node in nodes:
+            for other in nodes:
+                if other is not node:
+                    node.add_neighbor(other)
+        for node in nodes:
+            node.broadcast_message(f"ALERT from {node.node_id}")
+        network.run()
+        return nodes
+
+    stats = network_stats(flood())
+    messages = stats.get("delivered", 0) + stats.get("dropped", 0)
+    return flood, messages
+
+
+@benchmark("comms.socket_flood", params=("udp", "tcp"))
+def bench_socket_flood(protocol):
+    # The same ALERT flood on 20 nodes over localhost sockets, without
+    # injected latency or loss, so it times framing, socket writes and the loop
+    from communication_simulation import CommunicationNode, network_stats
+    from socket_transport import SocketNetwork
+
+    def flood():
+        network = SocketNetwork(protocol=protocol, latency=(0, 0), loss=0)
+        nodes = [CommunicationNode(f"Node-{i}", network=network, verbose=False)
+                 for i in range(20)]
+        for node in nodes:
+            for other in nodes:
+                if other is not node:
+                    node.add_neighbor(other)
+        for node in nodes:
+            node.broadcast_message(f"ALERT from {node.node_id}")
+        network.run()
+        # Nothing may go missing without injected loss; a lost frame also
+        # means the timing includes the idle timeout
+        if network.stats["lost"]:
+            raise RuntimeError(f"socket_flood[{protocol}] lost {network.stats['lost']} of "
+                               f"{network.stats['frames']} frames with loss=0")
+        return nodes
+
+    stats = network_stats(flood())
+    return flood, stats.get("delivered", 0)
+
+
+# --- live swarm dashboard (app.py) ---
+
+def _app():
+    # app.py opens its telemetry store on first use; keep it away from the
+    # real database (the producer only starts with the server)
+    if "app" not in sys.modules:
+        os.environ["OTS_TELEMETRY_DB"] = os.path.join(tempfile.mkdtemp(prefix="ots-bench-"),
+                                                      "telemetry.db")
+    import app
+    return app
+
+
+@benchmark("app.generate_swarm_data")
+def bench_generate_swarm_data(_):
+    app = _app()
+    random.seed(0)
+    return app.generate_swarm_data, 5
+
+
+@benchmark("app.build_figure")
+def bench_build_figure(_):
+    return _app().build_figure, 1
+
+
+@benchmark("app.figure_patch")
+def bench_figure_patch(_):
+    # Delta patch from one published tick to the next
+    app = _app()
+    random.seed(0)
+    tick = 1_000_000_000
+    store = app.get_store()
+    store.publish(tick - 1, app.generate_swarm_data())
+    store.publish(tick, app.generate_swarm_data())
+    app.swarm_snapshot(tick - 1)
+    app.swarm_snapshot(tick)
+    return (lambda: app.figure_patch(tick, tick - 1)), 1
+
+
+# --- runner ---
+
+def measure(run, repeat=5, min_time=0.2):
+    # Seconds per call: calls are batched so every sample lasts at least
+    # min_time, and the best of `repeat` samples is the headline number
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10 or loops >= 1_000_000:
+            break
+        loops *= 10
+    loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                run()
+            samples.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "loops": loops,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(selected=None, repeat=5, min_time=0.2, quick=False):
+    results = []
+    for name, (setup, params) in BENCHMARKS.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        for param in params[:1] if quick else params:
+            run, items = setup(param)
+            timing = measure(run, repeat=repeat, min_time=min_time)
+            results.append({
+                "name": name,
+                "param": param,
+                "items": items,
+                "items_per_second": items / timing["min"],
+                **timing,
+            })
+            label = name if param is None else f"{name}[{param}]"
+            print(f"{label:40} {timing['min'] * 1e3:10.3f} ms  {items / timing['min']:14,.0f} items/s")
+    return results
+
+
+def compare(base, current, threshold):
+    # Ratio of current to base time per benchmark; > 1 + threshold is a regression
+    base_times = {(r["name"], r["param"]): r["min"] for r in base["results"]}
+    regressions = []
+    print(f"\nCompared with {base.get('commit')} ({base.get('created')}):")
+    for result in current["results"]:
+        key = (result["name"], result["param"])
+        if key not in base_times:
+            continue
+        ratio = result["min"] / base_times[key]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        label = key[0] if key[1] is None else f"{key[0]}[{key[1]}]"
+        print(f"{label:40} {ratio:8.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the OTS hot paths and save the results as JSON.")
+    parser.add_argument("filter", nargs="*", help="only run benchmarks whose name contains one of these")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASE_JSON", help="compare against an earlier result file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per sample")
+    parser.add_argument("--quick", action="store_true", help="smallest parameter only, short samples")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, params) in BENCHMARKS.items():
+            print(name if params == (None,) else f"{name} {list(params)}")
+        return 0
+
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.05
+    commit = git_commit()
+    import numpy
+    import pandas
+    report = {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+        "results": run_benchmarks(args.filter, args.repeat, args.min_time, args.quick),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        if compare(base, report, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
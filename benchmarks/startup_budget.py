@@ -0,0 +1,137 @@
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(ROOT, "benchmarks", "startup_budget.json")
+MARKER = "-- ots startup imports --"
+
+
+def startup_imports(script):
+    # Modules a script imports before its first line of work: import
+    # statements at module level, outside any if/def/try block. Imports done
+    # inside a dashboard section only count when that section runs.
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def parse_importtime(stderr):
+    # (top-level total in µs, {module: self µs}, missing modules) from -X importtime output
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    total, self_times, missing = 0, {}, []
+    for line in lines:
+        if line.startswith("missing: "):
+            missing.append(line[len("missing: "):])
+            continue
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        self_times[name.strip()] = int(self_us)
+        # Nested imports are indented; top-level ones add up to the total
+        if not name[1:].startswith(" "):
+            total += int(cumulative_us)
+    return total, self_times, missing
+
+
+def measure(script, modules, runs=3):
+    # Fresh interpreter per run, so every module is imported cold
+    folder = os.path.dirname(os.path.abspath(script))
+    path = [folder, os.path.join(ROOT, "Code")]
+    code = (
+        "import sys\n"
+        f"sys.path[:0] = {path!r}\n"
+        f"sys.stderr.write({MARKER!r} + '\\n')\n"
+        f"for name in {modules!r}:\n"
+        "    try:\n"
+        "        __import__(name)\n"
+        "    except ImportError:\n"
+        "        sys.stderr.write('missing: ' + name + '\\n')\n"
+    )
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=folder,
+                              capture_output=True, text=True)
+        results.append(parse_importtime(proc.stderr))
+    totals = [total for total, _, _ in results]
+    best = min(range(runs), key=lambda i: totals[i])
+    _, self_times, missing = results[best]
+    slowest = sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        "modules": modules,
+        "missing": missing,
+        "best_ms": totals[best] / 1000,
+        "median_ms": statistics.median(totals) / 1000,
+        "slowest": [{"module": name, "self_ms": us / 1000} for name, us in slowest],
+        "imported": sorted(self_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure cold import time of the dashboards and fail over budget.")
+    parser.add_argument("--budgets", default=BUDGET_FILE,
+                        help="JSON file of {script: {budget_ms, deferred: [modules]}}")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="cold runs per script; the fastest one is compared to the budget")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="skip scripts whose imports are not installed instead of failing")
+    parser.add_argument("--output", help="also save the measurements as JSON")
+    args = parser.parse_args()
+
+    with open(args.budgets, encoding="utf-8") as f:
+        budgets = json.load(f)
+
+    report, failed = {}, []
+    for script, budget in budgets.items():
+        budget_ms = budget["budget_ms"]
+        path = os.path.join(ROOT, script)
+        result = measure(path, startup_imports(path), args.runs)
+        result["budget_ms"] = budget_ms
+        # Modules that belong to a section and must not load at startup. Wall
+        # time is noisy (about ±10% here even best-of-N); this check is exact.
+        result["eager"] = [name for name in budget.get("deferred", []) if name in result["imported"]]
+        report[script] = result
+        if result["missing"]:
+            # Without its heaviest imports the number says nothing about the budget
+            result["status"] = "SKIPPED" if args.allow_missing else "MISSING IMPORTS"
+            print(f"{script:40} {'-':>8}     (budget {budget_ms} ms)  {result['status']}")
+            print(f"    not installed: {', '.join(result['missing'])}")
+            if not args.allow_missing:
+                failed.append(script)
+            continue
+        result["status"] = ("OVER BUDGET" if result["best_ms"] > budget_ms else
+                            "EAGER IMPORTS" if result["eager"] else "OK")
+        print(f"{script:40} {result['best_ms']:8.1f} ms  (budget {budget_ms} ms)  {result['status']}"
+              f"  median {result['median_ms']:.1f} ms")
+        if result["eager"]:
+            print(f"    imported at startup, should be deferred: {', '.join(result['eager'])}")
+        for row in result["slowest"][:3]:
+            print(f"    {row['module']:36} {row['self_ms']:8.1f} ms")
+        if result["status"] != "OK":
+            failed.append(script)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                       "python": sys.version.split()[0], "results": report}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
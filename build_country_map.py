@@ -0,0 +1,99 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LEVELS_CSV = os.path.join(ROOT, "Docs", "ozone_levels_by_country.csv")
+COORDINATES_CSV = os.path.join(ROOT, "Docs", "country_coordinates.csv")
+# Loaded by ozone_country_dashboard.html, which renders the markers client-side
+DATA_FILE = os.path.join(ROOT, "ozone_country_data.js")
+# Bump when the data layout changes, so existing data files are rebuilt
+FORMAT_VERSION = 1
+
+# (upper bound in DU, name, colour, icon); a country gets the first zone it is below
+ZONES = [
+    (220, "Critical", "red", "🔴"),
+    (260, "Moderate", "orange", "🟠"),
+    (float("inf"), "Safe", "green", "🟢"),
+]
+
+
+def source_hash(*paths):
+    digest = hashlib.sha256(f"format-{FORMAT_VERSION}".encode("utf-8"))
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def stored_hash(path=DATA_FILE):
+    # Hash recorded on the first line of an existing data file, or None
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        first = f.readline()
+    prefix = "// source-sha256: "
+    return first[len(prefix):].strip() if first.startswith(prefix) else None
+
+
+def zone_index(du):
+    return next(i for i, (upper, *_) in enumerate(ZONES) if du < upper)
+
+
+def build_data(levels_csv=LEVELS_CSV, coordinates_csv=COORDINATES_CSV):
+    # Column-compact map data: one row per country with known coordinates
+    with open(coordinates_csv, newline="", encoding="utf-8") as f:
+        coordinates = {row["Country"]: (float(row["Latitude"]), float(row["Longitude"]))
+                       for row in csv.DictReader(f)}
+    rows, missing = [], []
+    with open(levels_csv, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = row["Country"]
+            if name not in coordinates:
+                missing.append(name)
+                continue
+            du = int(row["Estimated_Ozone_Level_DU"])
+            lat, lon = coordinates[name]
+            rows.append([name, lat, lon, du, zone_index(du), row["Notes"]])
+    data = {
+        "zones": [{"name": name, "color": color, "icon": icon} for _, name, color, icon in ZONES],
+        "columns": ["country", "lat", "lon", "du", "zone", "notes"],
+        "rows": rows,
+    }
+    return data, missing
+
+
+def write_data(data, digest, path=DATA_FILE):
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(f"// source-sha256: {digest}\n")
+        f.write("// Generated by build_country_map.py from Docs/ozone_levels_by_country.csv\n")
+        f.write(f"window.OZONE_COUNTRIES = {payload};\n")
+    os.replace(tmp_path, path)
+
+
+def build(force=False, output=DATA_FILE):
+    # Rebuild the data file if the CSVs changed; returns True if it was written
+    digest = source_hash(LEVELS_CSV, COORDINATES_CSV)
+    if not force and stored_hash(output) == digest:
+        return False
+    data, missing = build_data()
+    write_data(data, digest, output)
+    if missing:
+        print(f"⚠️ No coordinates for {len(missing)} countries (add them to {os.path.relpath(COORDINATES_CSV, ROOT)}): "
+              + ", ".join(missing[:10]) + (" ..." if len(missing) > 10 else ""))
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the country ozone map data from the CSV.")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the CSV is unchanged")
+    parser.add_argument("--output", default=DATA_FILE)
+    args = parser.parse_args()
+    if build(args.force, args.output):
+        print(f"✅ Wrote {args.output}")
+    else:
+        print(f"Up to date: {args.output}")
@@ -2,6 +2,8 @@ import ee
 import geemap
 import ipywidgets as widgets
 
+from gee_reductions import RegionReducer
+
 # Initialize Earth Engine
 ee.Initialize()
 
@@ -10,47 +12,41 @@ Map = geemap.Map(center=[20, 0], zoom=2)
 
 # Define continents with geometry (example polygons simplified)
 continents = {
-    'Africa': ee.Geometry.Polygon([
+    'Africa': [
         [[-17.7, 37.1], [51.2, 37.1], [51.2, -35.1], [-17.7, -35.1], [-17.7, 37.1]]
-    ]),
-    'Asia': ee.Geometry.Polygon([
+    ],
+    'Asia': [
         [[26.0, 81.0], [169.0, 81.0], [169.0, -11.0], [26.0, -11.0], [26.0, 81.0]]
-    ]),
+    ],
     # Add other continents similarly...
 }
 
 # Load ozone dataset (make sure this dataset is accessible)
-dataset = ee.ImageCollection('NASA/OMI/Aura_O3_Daily').select('O3_column_number_density')
-
-def add_continent_layer(cont_name, geom):
-    # Filter the dataset by date or keep as is
-    ozone_image = dataset.mean()  # Average over all time for demo
+DATASET_ID = 'NASA/OMI/Aura_O3_Daily'
+BAND = 'O3_column_number_density'
 
-    # Calculate mean ozone over the continent
-    mean_dict = ozone_image.reduceRegion(
-        reducer=ee.Reducer.mean(),
-        geometry=geom,
-        scale=10000,
-        maxPixels=1e9
-    )
-    mean_val = mean_dict.get('O3_column_number_density').getInfo()
+# Average over all time for demo; every continent is reduced in one request
+# and cached on disk, so reruns skip Earth Engine entirely
+reducer = RegionReducer(ee)
+continent_stats = reducer.reduce(DATASET_ID, BAND, continents, scale=10000)
 
-    # Get centroid coordinates for marker
-    center = geom.centroid().coordinates().getInfo()
+def add_continent_layer(cont_name, coords, stats):
+    mean_val = stats['mean']
+    center = stats['centroid']
 
     # Add the continent polygon
-    Map.addLayer(geom, {}, cont_name)
+    Map.addLayer(ee.Geometry.Polygon(coords), {}, cont_name)
 
     # Create popup widget with HTML
-    popup_widget = widgets.HTML(f"<b>{cont_name}</b><br>Avg Ozone: {mean_val:.7f} mol/m²")
+    ozone_text = "no data" if mean_val is None else f"{mean_val:.7f} mol/m²"
+    popup_widget = widgets.HTML(f"<b>{cont_name}</b><br>Avg Ozone: {ozone_text}")
 
     # Add marker with popup widget
     Map.add_marker(location=[center[1], center[0]], popup=popup_widget, icon_color='blue')
 
 # Add each continent
-for name, geometry in continents.items():
-    add_continent_layer(name, geometry)
+for name, coords in continents.items():
+    add_continent_layer(name, coords, continent_stats[name])
 
 # Show map
-Map
-
+Map
\ No newline at end of file
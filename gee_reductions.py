@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gee_cache")
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class RegionReducer:
+    # Region statistics for an Earth Engine image collection in one request.
+    # All regions go into one FeatureCollection that is reduced with
+    # reduceRegions, with centroids computed server-side in the same call.
+    # Results are cached on disk by dataset, band, date range, scale and a
+    # hash of the region geometries.
+    #
+    # `client` is anything that looks like the `ee` module (ImageCollection,
+    # Feature, FeatureCollection, Geometry.Polygon, Reducer.mean), so a local
+    # fake can stand in for Earth Engine.
+
+    def __init__(self, client=None, cache_dir=DEFAULT_CACHE_DIR):
+        if client is None:
+            import ee
+            client = ee
+        self.client = client
+        self.cache_dir = cache_dir
+
+    def cache_key(self, dataset_id, band, regions, start, end, scale):
+        return _digest({
+            "dataset": dataset_id,
+            "band": band,
+            "start": start,
+            "end": end,
+            "scale": scale,
+            "geometry": _digest(regions),
+        })
+
+    def reduce(self, dataset_id, band, regions, start=None, end=None, scale=10000):
+        # regions: {name: polygon coordinates as passed to ee.Geometry.Polygon}
+        # Returns {name: {"mean": value or None, "centroid": [lon, lat]}}
+        # start and end go together: both (a date range) or neither (all time)
+        if (start is None) != (end is None):
+            raise ValueError("Pass both start and end, or neither")
+        key = self.cache_key(dataset_id, band, regions, start, end, scale)
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+
+        results = self._fetch(dataset_id, band, regions, start, end, scale)
+        # A region without pixels comes back with mean None; keep that result
+        # out of the cache so the next run asks Earth Engine again
+        if any(stats["mean"] is None for stats in results.values()):
+            return results
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        os.replace(tmp_path, path)
+        return results
+
+    def _fetch(self, dataset_id, band, regions, start, end, scale):
+        ee = self.client
+        collection = ee.ImageCollection(dataset_id).select(band)
+        if start is not None:
+            collection = collection.filterDate(start, end)
+        image = collection.mean()
+
+        features = ee.FeatureCollection([
+            ee.Feature(ee.Geometry.Polygon(coords), {"name": name})
+            for name, coords in regions.items()
+        ])
+        reduced = image.reduceRegions(collection=features, reducer=ee.Reducer.mean(), scale=scale)
+        reduced = reduced.map(
+            lambda feature: feature.set("centroid", feature.geometry().centroid(1).coordinates())
+        )
+
+        # Single blocking round trip for every region
+        info = reduced.getInfo()
+        return {
+            feature["properties"]["name"]: {
+                "mean": feature["properties"].get("mean"),
+                "centroid": feature["properties"]["centroid"],
+            }
+            for feature in info["features"]
+        }
@@ -0,0 +1,3 @@
+// source-sha256: 268ed196e75396b5098dc0d4accba45bc6b15872e68407df770f64d4c0c67f35
+// Generated by build_country_map.py from Docs/ozone_levels_by_country.csv
+window.OZONE_COUNTRIES = {"zones":[{"name":"Critical","color":"red","icon":"🔴"},{"name":"Moderate","color":"orange","icon":"🟠"},{"name":"Safe","color":"green","icon":"🟢"}],"columns":["country","lat","lon","du","zone","notes"],"rows":[["Afghanistan",33.9391,67.71,300,2,"Estimated based on mid-latitude average"],["Algeria",28.0339,1.6596,280,2,"Estimated for lower mid-latitude"],["Argentina",-38.4161,-63.6167,350,2,"Estimated for southern mid-to-high latitude"],["Australia",-25.2744,133.7751,340,2,"Estimated for southern mid-to-high latitude"],["Austria",47.5162,14.5501,330,2,"Estimated based on mid-latitude average"],["Bangladesh",23.685,90.3563,260,2,"Estimated for equatorial region"],["Belgium",50.5039,4.4699,330,2,"Estimated based on mid-latitude average"],["Bolivia",-16.2902,-63.5887,270,2,"Estimated for equatorial region"],["Brazil",-14.235,-51.9253,270,2,"Estimated for equatorial region"],["Canada",56.1304,-106.3468,400,2,"Estimated for polar region; subject to Arctic depletion"],["Chile",-35.6751,-71.543,350,2,"Estimated for southern mid-to-high latitude"],["China",35.8617,104.1954,320,2,"Estimated for mid-latitude average"],["Colombia",4.5709,-74.2973,250,1,"Estimated for equatorial region"],["Cuba",21.5218,-77.7812,250,1,"Estimated for equatorial region"],["Egypt",26.8206,30.8025,280,2,"Estimated for lower mid-latitude"],["Ethiopia",9.145,40.4897,260,2,"Estimated for equatorial region"],["France",46.2276,2.2137,330,2,"Estimated based on mid-latitude average"],["Germany",51.1657,10.4515,340,2,"Estimated based on mid-latitude average"],["Ghana",7.9465,-1.0232,260,2,"Estimated for equatorial region"],["Greece",39.0742,21.8243,320,2,"Estimated based on mid-latitude average"],["India",20.5937,78.9629,270,2,"Estimated for equatorial region"],["Indonesia",-0.7893,113.9213,250,1,"Estimated for equatorial region"],["Iran",32.4279,53.688,300,2,"Estimated based on mid-latitude average"],["Iraq",33.2232,43.6793,300,2,"Estimated based on mid-latitude average"],["Italy",41.8719,12.5674,320,2,"Estimated based on mid-latitude average"],["Japan",36.2048,138.2529,330,2,"Estimated based on mid-latitude average"],["Kenya",0.0236,37.9062,260,2,"Estimated for equatorial region"],["Malaysia",4.2105,101.9758,250,1,"Estimated for equatorial region"],["Mexico",23.6345,-102.5528,270,2,"Estimated for equatorial region"],["Morocco",31.7917,-7.0926,280,2,"Estimated for lower mid-latitude"],["Netherlands",52.1326,5.2913,340,2,"Estimated for northern mid-latitude"],["New Zealand",-40.9006,174.886,350,2,"Estimated for southern mid-to-high latitude"],["Nigeria",9.082,8.6753,260,2,"Estimated for equatorial region"],["Norway",60.472,8.4689,400,2,"Estimated for polar region; subject to Arctic depletion"],["Pakistan",30.3753,69.3451,280,2,"Estimated for lower mid-latitude"],["Peru",-9.19,-75.0152,270,2,"Estimated for equatorial region"],["Philippines",12.8797,121.774,250,1,"Estimated for equatorial region"],["Poland",51.9194,19.1451,340,2,"Estimated for northern mid-latitude"],["Portugal",39.3999,-8.2245,320,2,"Estimated based on mid-latitude average"],["Russia",61.524,105.3188,400,2,"Estimated for polar region; subject to Arctic depletion"],["Saudi Arabia",23.8859,45.0792,270,2,"Estimated for equatorial region"],["South Africa",-30.5595,22.9375,300,2,"Estimated based on mid-latitude average"],["South Korea",35.9078,127.7669,330,2,"Estimated based on mid-latitude average"],["Spain",40.4637,-3.7492,320,2,"Estimated based on mid-latitude average"],["Sudan",12.8628,30.2176,260,2,"Estimated for equatorial region"],["Sweden",60.1282,18.6435,400,2,"Estimated for polar region; subject to Arctic depletion"],["Switzerland",46.8182,8.2275,330,2,"Estimated based on mid-latitude average"],["Thailand",15.87,100.9925,250,1,"Estimated for equatorial region"],["Turkey",38.9637,35.2433,320,2,"Estimated based on mid-latitude average"],["Ukraine",48.3794,31.1656,340,2,"Estimated for northern mid-latitude"],["United Kingdom",55.3781,-3.436,340,2,"Estimated for northern mid-latitude"],["United States",37.0902,-95.7129,350,2,"Estimated for northern mid-to-high latitude"],["Uruguay",-32.5228,-55.7658,340,2,"Estimated for southern mid-to-high latitude"],["Venezuela",6.4238,-66.5897,250,1,"Estimated for equatorial region"],["Vietnam",14.0583,108.2772,250,1,"Estimated for equatorial region"],["Zimbabwe",-19.0154,29.1549,260,2,"Estimated for equatorial region"]]};
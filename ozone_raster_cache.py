@@ -0,0 +1,210 @@
+import json
+import math
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ozone_rasters")
+STATS = {
+    "mean": np.nanmean,
+    "min": np.nanmin,
+    "max": np.nanmax,
+    "median": np.nanmedian,
+}
+
+
+def _day(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class OzoneRasterCache:
+    # Local store of daily global ozone grids.
+    # The grid is split into tiles; each tile is a memory-mapped .npy file of
+    # shape (days, tile_rows, tile_cols), and meta.json holds the time index
+    # (date -> slot). Region and time-range queries only touch the tiles that
+    # overlap the region and only the slots in the date range.
+    # Row 0 is the southernmost band (-90°), column 0 starts at -180°.
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, lat_res=1.0, lon_res=1.25, tile_shape=(45, 72),
+                 initial_days=32):
+        self.root = root
+        meta_path = os.path.join(root, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        else:
+            meta = {"lat_res": lat_res, "lon_res": lon_res, "tile_shape": list(tile_shape),
+                    "capacity": initial_days, "dates": []}
+        self.lat_res = meta["lat_res"]
+        self.lon_res = meta["lon_res"]
+        self.tile_shape = tuple(meta["tile_shape"])
+        self.capacity = meta["capacity"]
+        self.dates = meta["dates"]
+        self._slots = {d: i for i, d in enumerate(self.dates)}
+        self._ordinals = np.array([date.fromisoformat(d).toordinal() for d in self.dates], dtype=np.int64)
+        self.shape = (round(180 / self.lat_res), round(360 / self.lon_res))
+        self.tiles = (math.ceil(self.shape[0] / self.tile_shape[0]),
+                      math.ceil(self.shape[1] / self.tile_shape[1]))
+        self._memmaps = {}
+        os.makedirs(os.path.join(root, "tiles"), exist_ok=True)
+
+    # --- storage ---
+
+    def _tile_path(self, r, c):
+        return os.path.join(self.root, "tiles", f"r{r:03d}_c{c:03d}.npy")
+
+    def _tile(self, r, c):
+        tile = self._memmaps.get((r, c))
+        if tile is None:
+            path = self._tile_path(r, c)
+            if os.path.exists(path):
+                tile = np.load(path, mmap_mode="r+")
+            else:
+                tile = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=np.float32, shape=(self.capacity, *self.tile_shape)
+                )
+                tile[:] = np.nan
+            self._memmaps[(r, c)] = tile
+        return tile
+
+    def _grow(self):
+        # Double the day capacity of every tile file
+        new_capacity = self.capacity * 2
+        for r in range(self.tiles[0]):
+            for c in range(self.tiles[1]):
+                old = self._tile(r, c)
+                path = self._tile_path(r, c)
+                new = np.lib.format.open_memmap(
+                    f"{path}.tmp", mode="w+", dtype=np.float32,
+                    shape=(new_capacity, *self.tile_shape)
+                )
+                new[:self.capacity] = old
+                new[self.capacity:] = np.nan
+                new.flush()
+                del new
+                self._memmaps.pop((r, c))
+                del old
+                os.replace(f"{path}.tmp", path)
+        self.capacity = new_capacity
+
+    def _save_meta(self):
+        meta = {"lat_res": self.lat_res, "lon_res": self.lon_res, "tile_shape": list(self.tile_shape),
+                "capacity": self.capacity, "dates": self.dates}
+        tmp_path = os.path.join(self.root, "meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.root, "meta.json"))
+
+    def has(self, day):
+        return _day(day).isoformat() in self._slots
+
+    def add_day(self, day, grid):
+        # grid: (rows, cols) array on this cache's lat/lon grid, NaN for no data
+        key = _day(day).isoformat()
+        grid = np.asarray(grid, dtype=np.float32)
+        if grid.shape != self.shape:
+            raise ValueError(f"Expected a {self.shape} grid, got {grid.shape}")
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self.dates)
+            if slot >= self.capacity:
+                self._grow()
+        th, tw = self.tile_shape
+        for r in range(self.tiles[0]):
+            for c in range(self.tiles[1]):
+                block = grid[r * th:(r + 1) * th, c * tw:(c + 1) * tw]
+                tile = self._tile(r, c)
+                tile[slot, :block.shape[0], :block.shape[1]] = block
+                tile.flush()
+        if key not in self._slots:
+            self._slots[key] = slot
+            self.dates.append(key)
+            self._ordinals = np.append(self._ordinals, _day(day).toordinal())
+            self._save_meta()
+
+    def ensure(self, start, end, fetch):
+        # Fetch (via fetch(day) -> grid) every day in [start, end] not cached yet
+        day, end = _day(start), _day(end)
+        while day <= end:
+            if not self.has(day):
+                self.add_day(day, fetch(day))
+            day += timedelta(days=1)
+
+    # --- queries ---
+
+    def _slots_between(self, start, end):
+        # Cached slots with start <= date <= end, in date order
+        lo, hi = _day(start).toordinal(), _day(end).toordinal()
+        slots = np.flatnonzero((self._ordinals >= lo) & (self._ordinals <= hi))
+        return slots[np.argsort(self._ordinals[slots], kind="stable")]
+
+    def _cells(self, lat_min, lat_max, lon_min, lon_max):
+        rows = (max(0, math.floor((lat_min + 90) / self.lat_res)),
+                min(self.shape[0], math.ceil((lat_max + 90) / self.lat_res)))
+        cols = (max(0, math.floor((lon_min + 180) / self.lon_res)),
+                min(self.shape[1], math.ceil((lon_max + 180) / self.lon_res)))
+        return rows, cols
+
+    def region(self, lat_min, lat_max, lon_min, lon_max, start, end):
+        # (days, rows, cols) values of a lat/lon box, read from overlapping tiles only
+        slots = self._slots_between(start, end)
+        (r0, r1), (c0, c1) = self._cells(lat_min, lat_max, lon_min, lon_max)
+        out = np.full((len(slots), max(0, r1 - r0), max(0, c1 - c0)), np.nan, dtype=np.float32)
+        if not len(slots) or r1 <= r0 or c1 <= c0:
+            return out
+        th, tw = self.tile_shape
+        for r in range(r0 // th, (r1 - 1) // th + 1):
+            for c in range(c0 // tw, (c1 - 1) // tw + 1):
+                tr0, tr1 = max(r0, r * th), min(r1, (r + 1) * th)
+                tc0, tc1 = max(c0, c * tw), min(c1, (c + 1) * tw)
+                tile = self._tile(r, c)
+                out[:, tr0 - r0:tr1 - r0, tc0 - c0:tc1 - c0] = \
+                    tile[slots, tr0 - r * th:tr1 - r * th, tc0 - c * tw:tc1 - c * tw]
+        return out
+
+    def reduce_region(self, lat_min, lat_max, lon_min, lon_max, start, end, stat="mean", q=None,
+                      per_day=False):
+        # Unweighted NaN-aware statistic over a box and date range: "mean",
+        # "min", "max", "median" or "percentile" (with q). per_day=True gives
+        # one value per cached day instead of a single number.
+        values = self.region(lat_min, lat_max, lon_min, lon_max, start, end)
+        axis = (1, 2) if per_day else None
+        if stat == "percentile":
+            return np.nanpercentile(values, q, axis=axis)
+        return STATS[stat](values, axis=axis)
+
+    def time_aggregate(self, start, end, stat="mean", q=None):
+        # Global (rows, cols) grid of a statistic over the date range
+        values = self.region(-90, 90, -180, 180, start, end)
+        if stat == "percentile":
+            return np.nanpercentile(values, q, axis=0)
+        return STATS[stat](values, axis=0)
+
+
+def earth_engine_fetcher(cache, dataset_id="TOMS/MERGED", band="ozone", client=None):
+    # fetch(day) for OzoneRasterCache.ensure: one computePixels request per day,
+    # resampled by Earth Engine onto the cache grid
+    if client is None:
+        import ee
+        client = ee
+
+    def fetch(day):
+        day = _day(day)
+        image = client.ImageCollection(dataset_id).filterDate(
+            day.isoformat(), (day + timedelta(days=1)).isoformat()
+        ).select(band).mean()
+        pixels = client.data.computePixels({
+            "expression": image,
+            "fileFormat": "NUMPY_NDARRAY",
+            "grid": {
+                "dimensions": {"width": cache.shape[1], "height": cache.shape[0]},
+                "affineTransform": {"scaleX": cache.lon_res, "shearX": 0, "translateX": -180,
+                                    "shearY": 0, "scaleY": -cache.lat_res, "translateY": 90},
+                "crsCode": "EPSG:4326",
+            },
+        })
+        # Earth Engine returns rows north to south
+        return np.asarray(pixels[band], dtype=np.float32)[::-1]
+
+    return fetch
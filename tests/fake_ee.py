@@ -0,0 +1,103 @@
+# Minimal stand-in for the `ee` module, covering what RegionReducer uses.
+# Region means come from a {name: mean} dict (missing names reduce to None,
+# like a region without pixels); every getInfo() call is counted.
+
+
+class _Geometry:
+    def __init__(self, coords):
+        self.coords = coords
+
+    def centroid(self, max_error=None):
+        points = self.coords[0] if isinstance(self.coords[0][0], (list, tuple)) else self.coords
+        lons = [lon for lon, _ in points]
+        lats = [lat for _, lat in points]
+        return _Geometry([sum(lons) / len(lons), sum(lats) / len(lats)])
+
+    def coordinates(self):
+        return self.coords
+
+
+class _GeometryModule:
+    Polygon = _Geometry
+
+
+class _Reducer:
+    @staticmethod
+    def mean():
+        return "mean"
+
+
+class _Feature:
+    def __init__(self, geometry, properties=None):
+        self._geometry = geometry
+        self.properties = dict(properties or {})
+
+    def geometry(self):
+        return self._geometry
+
+    def set(self, name, value):
+        if isinstance(value, _Geometry):
+            value = value.coords
+        return _Feature(self._geometry, {**self.properties, name: value})
+
+
+class _FeatureCollection:
+    def __init__(self, fake, features):
+        self.fake = fake
+        self.features = list(features)
+
+    def map(self, fn):
+        return _FeatureCollection(self.fake, [fn(feature) for feature in self.features])
+
+    def getInfo(self):
+        self.fake.requests += 1
+        return {"features": [{"type": "Feature", "properties": feature.properties}
+                             for feature in self.features]}
+
+
+class _Image:
+    def __init__(self, fake, filters):
+        self.fake = fake
+        self.filters = filters
+
+    def reduceRegions(self, collection, reducer, scale):
+        self.fake.reductions.append({"filters": self.filters, "reducer": reducer, "scale": scale})
+        return _FeatureCollection(self.fake, [
+            feature.set("mean", self.fake.means.get(feature.properties["name"]))
+            for feature in collection.features
+        ])
+
+
+class _ImageCollection:
+    def __init__(self, fake, dataset_id, filters=()):
+        self.fake = fake
+        self.dataset_id = dataset_id
+        self.filters = filters
+
+    def select(self, band):
+        return _ImageCollection(self.fake, self.dataset_id, self.filters + (("select", band),))
+
+    def filterDate(self, start, end=None):
+        return _ImageCollection(self.fake, self.dataset_id, self.filters + (("date", start, end),))
+
+    def mean(self):
+        return _Image(self.fake, self.filters)
+
+
+class FakeEE:
+    Geometry = _GeometryModule
+    Reducer = _Reducer
+
+    def __init__(self, means):
+        self.means = means
+        self.requests = 0
+        self.reductions = []
+
+    def ImageCollection(self, dataset_id):
+        return _ImageCollection(self, dataset_id)
+
+    def Feature(self, geometry, properties=None):
+        return _Feature(geometry, properties)
+
+    def FeatureCollection(self, features):
+        return _FeatureCollection(self, features)
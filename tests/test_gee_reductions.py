@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_ee import FakeEE
+from gee_reductions import RegionReducer
+
+REGIONS = {
+    "North": [[[0, 10], [10, 10], [10, 20], [0, 20]]],
+    "South": [[[0, -20], [10, -20], [10, -10], [0, -10]]],
+}
+
+
+def test_reduce_returns_means_and_centroids(tmp_path):
+    ee = FakeEE({"North": 0.12, "South": 0.08})
+    results = RegionReducer(ee, cache_dir=str(tmp_path)).reduce(
+        "DATASET", "BAND", REGIONS, "2020-01-01", "2021-01-01", scale=5000)
+    assert results == {
+        "North": {"mean": 0.12, "centroid": [5.0, 15.0]},
+        "South": {"mean": 0.08, "centroid": [5.0, -15.0]},
+    }
+    assert ee.requests == 1
+    assert ee.reductions[0]["filters"] == (("select", "BAND"), ("date", "2020-01-01", "2021-01-01"))
+    assert ee.reductions[0]["scale"] == 5000
+
+
+def test_second_reduce_is_served_from_disk_cache(tmp_path):
+    first = RegionReducer(FakeEE({"North": 0.12, "South": 0.08}), cache_dir=str(tmp_path))
+    expected = first.reduce("DATASET", "BAND", REGIONS)
+    ee = FakeEE({})
+    assert RegionReducer(ee, cache_dir=str(tmp_path)).reduce("DATASET", "BAND", REGIONS) == expected
+    assert ee.requests == 0
+
+
+def test_missing_means_are_returned_but_not_cached(tmp_path):
+    ee = FakeEE({"North": 0.12})
+    reducer = RegionReducer(ee, cache_dir=str(tmp_path))
+    assert reducer.reduce("DATASET", "BAND", REGIONS)["South"]["mean"] is None
+    reducer.reduce("DATASET", "BAND", REGIONS)
+    assert ee.requests == 2
+    assert not os.listdir(tmp_path)
+
+
+def test_half_open_date_range_is_rejected(tmp_path):
+    reducer = RegionReducer(FakeEE({}), cache_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        reducer.reduce("DATASET", "BAND", REGIONS, start="2020-01-01")
+    with pytest.raises(ValueError):
+        reducer.reduce("DATASET", "BAND", REGIONS, end="2021-01-01")
@@ -0,0 +1,36 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Code"))
+
+from maneuver_log import ManeuverLog
+
+
+def test_between_keeps_events_sharing_a_timestamp(tmp_path):
+    log = ManeuverLog(str(tmp_path), index_every=4)
+    for i in range(8):
+        log.append({"timestamp": "2025-01-01T00:00:00", "event": i})
+    for i in range(8, 10):
+        log.append({"timestamp": "2025-01-01T00:00:05", "event": i})
+    events = list(log.between("2025-01-01T00:00:00", "2025-01-01T00:00:10"))
+    assert [e["event"] for e in events] == list(range(10))
+    events = list(log.between("2025-01-01T00:00:05", "2025-01-01T00:00:10"))
+    assert [e["event"] for e in events] == [8, 9]
+
+
+def test_segment_orphaned_by_a_crash_is_discarded(tmp_path):
+    with ManeuverLog(str(tmp_path)) as log:
+        log.append({"timestamp": "2025-01-01T00:00:00", "event": 0})
+    # A rotation that wrote its segment but crashed before saving the manifest
+    (tmp_path / "segment-000002.jsonl").write_bytes(b'{"timestamp": "2024-12-31T00:00:00", "ev')
+    (tmp_path / "segment-000002.idx").write_text("1735603200.0 0\n")
+
+    with ManeuverLog(str(tmp_path)) as log:
+        log.append({"timestamp": "2024-12-31T00:00:00", "event": 1})  # older: rotates
+        log.append({"timestamp": "2024-12-31T00:00:01", "event": 2})
+    log = ManeuverLog(str(tmp_path))
+    events = list(log.between("2024-12-30T00:00:00", "2025-01-02T00:00:00"))
+    assert [e["event"] for e in events] == [1, 2, 0]
+    with open(tmp_path / "manifest.json", encoding="utf-8") as f:
+        assert [s["name"] for s in json.load(f)["segments"]] == ["segment-000001", "segment-000002"]
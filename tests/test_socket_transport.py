@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Communication with drones"))
+
+from communication_simulation import CommunicationNode
+from socket_transport import SocketNetwork
+
+
+def make_swarm(network, size=6):
+    nodes = [CommunicationNode(f"Drone-{i}", network=network, verbose=False) for i in range(size)]
+    for node in nodes:
+        for other in nodes:
+            if other is not node:
+                node.add_neighbor(other)
+    return nodes
+
+
+@pytest.mark.parametrize("protocol", ["udp", "tcp"])
+def test_timed_run_counts_frames_in_flight_as_lost(protocol):
+    network = SocketNetwork(protocol=protocol, latency=(0.5, 0.5), loss=0, seed=1)
+    nodes = make_swarm(network)
+    nodes[0].broadcast_message("status")
+    network.run(until=0.05)
+    assert network.stats["lost"] == len(nodes) - 1
+    assert network.in_flight == 0
+
+
+@pytest.mark.parametrize("protocol", ["udp", "tcp"])
+def test_network_runs_again_from_a_clean_state(protocol):
+    network = SocketNetwork(protocol=protocol, latency=(0, 0), loss=0, seed=1)
+    nodes = make_swarm(network)
+    for _ in range(2):
+        nodes[0].broadcast_message("status")
+        network.run()
+        assert network.in_flight == 0
+        assert not network._batches and not network._ready and not network._flush_scheduled
+        assert not network._accepted and not network._connections and not network._endpoints
+    assert network.stats["lost"] == 0
+    assert nodes[0].stats["delivered"] >= 2 * (len(nodes) - 1)
+
+
+def test_registering_a_node_while_running_is_rejected():
+    network = SocketNetwork(latency=(0, 0), loss=0, seed=1)
+    make_swarm(network, size=2)
+
+    async def scenario():
+        serving = asyncio.ensure_future(network.serve(until=0.05))
+        await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError, match="Drone-late"):
+            CommunicationNode("Drone-late", network=network, verbose=False)
+        await serving
+
+    asyncio.run(scenario())
+    assert "Drone-late" not in network.nodes
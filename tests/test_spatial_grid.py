@@ -0,0 +1,54 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Code"))
+
+from spatial_grid import SpatialHashGrid, haversine_km, random_positions
+
+
+def _points():
+    # Spread over the globe, plus clusters straddling ±180° and at both poles
+    rng = np.random.default_rng(7)
+    lats, lons = random_positions(rng, 400)
+    edge_lats = rng.uniform(-60, 60, 100)
+    edge_lons = np.where(rng.random(100) < 0.5, rng.uniform(178, 180, 100), rng.uniform(-180, -178, 100))
+    north_lats, north_lons = rng.uniform(87, 90, 60), rng.uniform(-180, 180, 60)
+    south_lats, south_lons = rng.uniform(-90, -87, 60), rng.uniform(-180, 180, 60)
+    return (np.concatenate([lats, edge_lats, north_lats, south_lats]),
+            np.concatenate([lons, edge_lons, north_lons, south_lons]))
+
+
+def _brute_pairs(lats, lons, radius_km):
+    distances = haversine_km(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+    i, j = np.nonzero(np.triu(distances <= radius_km, k=1))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+@pytest.mark.parametrize("cell_km", [100.0, 250.0, 1000.0])
+@pytest.mark.parametrize("radius_km", [50.0, 300.0, 2500.0])
+def test_within_matches_brute_force(cell_km, radius_km):
+    lats, lons = _points()
+    grid = SpatialHashGrid(cell_km)
+    grid.rebuild(lats, lons)
+    queries = [(0.0, 179.9), (10.0, -179.95), (-30.0, 180.0), (89.9, 45.0), (-89.9, -120.0),
+               (90.0, 0.0), (45.0, 10.0)]
+    for lat, lon in queries:
+        indices, distances = grid.within(lat, lon, radius_km)
+        expected = np.nonzero(haversine_km(lat, lon, lats, lons) <= radius_km)[0]
+        assert sorted(indices.tolist()) == expected.tolist()
+        assert np.all(np.diff(distances) >= 0)
+
+
+@pytest.mark.parametrize("cell_km", [100.0, 250.0, 1000.0])
+@pytest.mark.parametrize("radius_km", [50.0, 300.0, 2500.0])
+def test_pairs_within_matches_brute_force(cell_km, radius_km):
+    lats, lons = _points()
+    grid = SpatialHashGrid(cell_km)
+    grid.rebuild(lats, lons)
+    first, second = grid.pairs_within(radius_km)
+    pairs = list(zip(first.tolist(), second.tolist()))
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == _brute_pairs(lats, lons, radius_km)
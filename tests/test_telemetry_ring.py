@@ -0,0 +1,29 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Official dashboard infor"))
+
+from telemetry_ring import TelemetryRing
+
+
+@pytest.fixture
+def new_york_time(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_report_timestamps_are_read_as_utc(new_york_time):
+    ring = TelemetryRing(capacity=4, max_units=2)
+    ring.ingest({"Unit ID": "OTS-001", "Cycle": 1, "Timestamp": "2025-01-01 00:00:00"})
+    ring.ingest_columns({"Unit ID": ["OTS-002"], "Cycle": [2], "Timestamp": ["2025-01-01 00:00:05"]})
+    assert ring.latest("OTS-001")["timestamp"] == 1735689600.0
+    assert ring.latest("OTS-002")["timestamp"] == 1735689605.0